@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Android API',
-    'version': '18.0.17.0.0',
+    'version': '18.0.19.0.0',
     'category': 'Technical',
     'summary': 'REST API endpoints for Android app integration',
     'description': """
@@ -27,7 +27,11 @@
         - Transaction handling for batch operations
         - Foreign key validation
         - ISO 8601 datetime format
-        - Webhook notifications for record changes
+        - mobile_uid is unique per model (UNIQUE constraint, backed by a unique
+          index), so upserts by mobile_uid are single index lookups
+        - Webhook notifications for record changes (install queue_job for
+          guaranteed delivery; without it deliveries are best-effort and
+          those still queued when a worker stops may be lost)
         - OpenAPI/Swagger specification included
 
         ## Documentation
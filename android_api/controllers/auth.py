@@ -1,24 +1,85 @@
 # -*- coding: utf-8 -*-
 
 from odoo.http import request, Response
-from datetime import datetime
+from odoo.tools import SQL
+from werkzeug.http import parse_accept_header
+from datetime import date, datetime, timezone
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import time
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from ..tools.auth_cache import (
+    auth_cache, auth_negative_cache, cache_put, AUTH_CACHE_TTL, AUTH_CACHE_MAX_SIZE,
+    AUTH_NEGATIVE_CACHE_TTL, AUTH_NEGATIVE_CACHE_MAX_SIZE,
+)
 
 _logger = logging.getLogger(__name__)
 
-# Rate limiting storage (in-memory, resets on restart)
-_rate_limit_store = {}
+# Rate limiting storage (in-memory, resets on restart): (client_id, window) -> count
+# Used when Redis is not configured or unreachable.
+# Counters are inserted in window order, so the oldest ones come first.
+_rate_limit_counts = {}
+_rate_limit_swept_window = None  # last window whose predecessors were dropped
 RATE_LIMIT_REQUESTS = 100  # requests per window
 RATE_LIMIT_WINDOW = 60  # seconds
-
+RATE_LIMIT_MAX_ENTRIES = 10000  # hard cap, the oldest counters are evicted beyond it
+
+# Fallback formats accepted by parse_datetime when ISO 8601 parsing fails
+DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S',  # ISO 8601
+    '%Y-%m-%dT%H:%M:%SZ',  # ISO 8601 with Z
+    '%Y-%m-%d %H:%M:%S',  # Legacy format
+    '%Y-%m-%d',  # Date only
+)
+
+# Largest accepted POST body: 100 records with a full 5000 character memo
+# stay well below it, so anything larger is rejected before it is parsed
+MAX_JSON_BODY_SIZE = 2 * 1024 * 1024  # bytes
+
+# Records serialized per chunk when streaming paginated responses
+PAGINATION_CHUNK_SIZE = 100
+
+# gzip level for paginated responses: level 1 is nearly free in CPU and still
+# shrinks JSON several times, which is what matters on mobile connections
+GZIP_LEVEL = 1
+BROTLI_QUALITY = 4  # brotli is preferred when installed and accepted by the client
+COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are sent uncompressed
+
+# Shared rate limiting backend (optional, see _get_redis)
+_redis_client = None
+_redis_url = None
+_redis_token_bucket = None
+REDIS_TIMEOUT = 0.5  # seconds
 
 def api_authenticate():
     """
     Authenticate API request using Authorization header.
     Supports both "Bearer <key>" and raw key formats.
     Returns True if authenticated, False otherwise.
+
+    Successful validations are cached for AUTH_CACHE_TTL seconds. Deleting,
+    revoking or expiring an API key clears the cache of the worker doing it, but
+    other workers may accept the revoked key until their entry expires.
+    Rejected keys are cached for AUTH_NEGATIVE_CACHE_TTL seconds.
     """
     api_key = request.httprequest.headers.get('Authorization')
     if not api_key:
@@ -28,7 +89,24 @@ def api_authenticate():
     # Support both "Bearer <key>" and raw key formats
     api_key = api_key.replace('Bearer ', '').strip()
 
-    user_id = request.env['res.users.apikeys']._check_credentials(scope='rpc', key=api_key)
+    cache_key = (request.env.cr.dbname, hashlib.sha256(api_key.encode('utf-8')).digest())
+    now = time.monotonic()
+
+    cached = auth_cache.get(cache_key)
+    if cached and now < cached[1]:
+        user_id = cached[0]
+        # Move the entry to the end so busy keys are the last to be evicted
+        auth_cache[cache_key] = auth_cache.pop(cache_key, cached)
+    elif auth_negative_cache.get(cache_key, 0) > now:
+        # Recently rejected key: skip the key hash verification
+        user_id = False
+    else:
+        user_id = request.env['res.users.apikeys']._check_credentials(scope='rpc', key=api_key)
+        if user_id:
+            cache_put(auth_cache, cache_key, (user_id, now + AUTH_CACHE_TTL), AUTH_CACHE_MAX_SIZE)
+        else:
+            cache_put(auth_negative_cache, cache_key, now + AUTH_NEGATIVE_CACHE_TTL,
+                      AUTH_NEGATIVE_CACHE_MAX_SIZE)
 
     if user_id:
         request.env.user = request.env['res.users'].browse(user_id)
@@ -63,10 +141,60 @@ def get_pagination_params():
     return limit, offset
 
 
+def get_count_param():
+    """
+    Tell whether the client wants the total number of matches.
+
+    Clients that page with `next_after_id`/`has_more` can pass `count=0`
+    to skip counting, the most expensive part of a filterless GET on a
+    large table. `total` is then null in the response.
+    """
+    return request.httprequest.args.get('count', '1') != '0'
+
+
+def get_after_id():
+    """
+    Extract the keyset pagination cursor from query string.
+    Returns the `after_id` as int, or None when it is absent or invalid.
+
+    Paging with `after_id` (the `next_after_id` of the previous page) lets
+    PostgreSQL jump to the next page through the primary key index instead
+    of scanning and discarding `offset` rows.
+    """
+    try:
+        after_id = int(request.httprequest.args.get('after_id', 0))
+    except (ValueError, TypeError):
+        return None
+    return after_id if after_id > 0 else None
+
+
+def _json_default(value):
+    """Serialize values the JSON encoders do not handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='seconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_dumps(data):
+    """
+    Serialize data to JSON bytes, using orjson when it is installed.
+    Dates and datetimes are emitted as ISO 8601 by both encoders.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_OMIT_MICROSECONDS)
+    return json.dumps(data, default=_json_default).encode('utf-8')
+
+
+# Pre-serialized body for the most common rejection
+_UNAUTHORIZED_BODY = _json_dumps({"error": "Unauthorized"})
+
+
 def json_response(data, status=200):
     """Create a JSON response with proper content type."""
     return Response(
-        json.dumps(data, default=str),
+        _json_dumps(data),
         status=status,
         content_type='application/json'
     )
@@ -78,21 +206,172 @@ def json_error(message, status=400, details=None):
     if details:
         error_data["details"] = details
     return Response(
-        json.dumps(error_data),
+        _json_dumps(error_data),
         status=status,
         content_type='application/json'
     )
 
 
-def paginated_response(data, total, limit, offset):
-    """Create a paginated JSON response with metadata."""
-    return json_response({
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-        "count": len(data),
-        "data": data
-    })
+def unauthorized_response():
+    """Create the HTTP 401 response returned when authentication fails."""
+    return Response(
+        _UNAUTHORIZED_BODY,
+        status=401,
+        content_type='application/json'
+    )
+
+
+def encode_rows(rows):
+    """Encode a list of dicts as the comma-separated body of a JSON array."""
+    return b','.join(_json_dumps(row) for row in rows)
+
+
+def _encode_chunks(data):
+    """Lazily encode data in chunks of PAGINATION_CHUNK_SIZE records."""
+    for start in range(0, len(data), PAGINATION_CHUNK_SIZE):
+        yield encode_rows(data[start:start + PAGINATION_CHUNK_SIZE])
+
+
+def _stream_paginated(chunks, total, limit, offset, count, next_after_id=None):
+    """
+    Yield a paginated JSON document from already encoded record chunks,
+    so large pages are never held as one big string next to the data itself.
+    """
+    if total is None:
+        # Not counted: a full page means there may be more
+        has_more = count == limit
+        total = 'null'
+    else:
+        has_more = offset + count < total
+    header = '{"total":%s,"limit":%d,"offset":%d,"count":%d,"has_more":%s,' % (
+        total, limit, offset, count, 'true' if has_more else 'false')
+    if next_after_id is not None:
+        header += '"next_after_id":%d,' % next_after_id
+    yield header.encode('utf-8') + b'"data":['
+
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        yield chunk if first else b',' + chunk
+        first = False
+
+    yield b']}'
+
+
+def _body_too_large_error():
+    """Create the 413 response for bodies over MAX_JSON_BODY_SIZE."""
+    return json_error(
+        "Request body too large",
+        status=413,
+        details={"max_bytes": MAX_JSON_BODY_SIZE}
+    )
+
+
+def get_json_body():
+    """
+    Parse the request body as JSON, using orjson when it is installed.
+    Returns (payload, error_response) tuple.
+
+    Bodies over MAX_JSON_BODY_SIZE are rejected without being parsed: those
+    announcing a larger Content-Length are not read at all, and chunked or
+    length-less ones are checked once read. Odoo's HTTPRequest only proxies
+    get_data(), not the underlying werkzeug stream.
+    """
+    content_length = request.httprequest.content_length
+    if content_length and content_length > MAX_JSON_BODY_SIZE:
+        return None, _body_too_large_error()
+
+    body = request.httprequest.get_data()
+    if len(body) > MAX_JSON_BODY_SIZE:
+        return None, _body_too_large_error()
+
+    try:
+        if orjson is not None:
+            return orjson.loads(body), None
+        return json.loads(body), None
+    except ValueError:  # Also covers orjson.JSONDecodeError
+        return None, json_error("Request body must be valid JSON")
+
+
+def paginated_response(data, total, limit, offset, next_after_id=None):
+    """
+    Create a streamed paginated JSON response with metadata.
+
+    Endpoints supporting keyset pagination pass the id of their last record
+    as next_after_id, which is then included in the metadata.
+    """
+    return paginated_chunks_response(
+        _encode_chunks(data), total, limit, offset, len(data), next_after_id)
+
+
+def paginated_chunks_response(chunks, total, limit, offset, count, next_after_id=None):
+    """
+    Create a streamed paginated JSON response from chunks built with
+    encode_rows(), for callers that serialize their page batch by batch.
+    """
+    body, encoding = _compress_stream(
+        _stream_paginated(chunks, total, limit, offset, count, next_after_id))
+    headers = {'Vary': 'Accept-Encoding'}
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(
+        body,
+        status=200,
+        content_type='application/json',
+        headers=headers
+    )
+
+
+def _compress_stream(body):
+    """
+    Compress a streamed body with the best encoding the client accepts.
+    Returns (body, content_encoding) tuple, content_encoding being None
+    when the body is sent as is.
+
+    The beginning of the body is encoded up front, so a response shorter
+    than COMPRESS_MIN_SIZE is detected and is not compressed.
+
+    Odoo's HTTPRequest does not proxy werkzeug's accept_encodings, so the
+    Accept-Encoding header is parsed here; unlisted encodings have quality 0.
+    """
+    accept_encodings = parse_accept_header(
+        request.httprequest.headers.get('Accept-Encoding', ''))
+    if brotli is not None and accept_encodings['br']:
+        compress, encoding = _brotli_stream, 'br'
+    elif accept_encodings['gzip']:
+        compress, encoding = _gzip_stream, 'gzip'
+    else:
+        return body, None
+
+    head = []
+    size = 0
+    for chunk in body:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= COMPRESS_MIN_SIZE:
+            return compress(itertools.chain(head, body)), encoding
+    return head, None
+
+
+def _brotli_stream(chunks):
+    """Compress a stream of byte chunks with brotli."""
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def _gzip_stream(chunks):
+    """Compress a stream of byte chunks into a single gzip member."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
 
 
 def validate_required_fields(data, required_fields):
@@ -100,10 +379,7 @@ def validate_required_fields(data, required_fields):
     Validate that all required fields are present in data.
     Returns (is_valid, error_response) tuple.
     """
-    missing = []
-    for field in required_fields:
-        if field not in data or data[field] is None:
-            missing.append(field)
+    missing = [field for field in required_fields if data.get(field) is None]
 
     if missing:
         return False, json_error(
@@ -114,16 +390,48 @@ def validate_required_fields(data, required_fields):
     return True, None
 
 
+def validate_records_are_objects(records):
+    """
+    Validate that every item of a batch payload is a JSON object.
+    Returns (is_valid, error_response) tuple.
+
+    Run once on the whole batch before per-record validation, so the
+    per-record checks can assume dict items.
+    """
+    for idx, data in enumerate(records):
+        if not isinstance(data, dict):
+            return False, json_error(
+                f"Validation failed at index {idx}",
+                status=400,
+                details={"index": idx, "expected": "JSON object"}
+            )
+    return True, None
+
+
 def validate_foreign_key(model, record_id, field_name):
     """
     Validate that a foreign key reference exists.
     Returns (is_valid, error_response) tuple.
+
+    Results are memoized on the current request, so a batch referencing the
+    same record many times only queries it once.
     """
     if not record_id:
         return True, None  # Allow None/False values
 
-    record = request.env[model].sudo().browse(record_id).exists()
-    if not record:
+    fk_cache = getattr(request, '_android_api_fk_cache', None)
+    if fk_cache is None:
+        fk_cache = request._android_api_fk_cache = {}
+
+    cache_key = (model, record_id)
+    exists = fk_cache.get(cache_key)
+    if exists is None:
+        exists = fk_cache[cache_key] = bool(
+            request.env[model].sudo().with_context(active_test=False).search_count(
+                [('id', '=', record_id)], limit=1)
+        )
+
+    if not exists:
         return False, json_error(
             f"Invalid {field_name}",
             status=400,
@@ -132,60 +440,214 @@ def validate_foreign_key(model, record_id, field_name):
     return True, None
 
 
+def prefetch_foreign_keys(model, record_ids):
+    """
+    Check many foreign key references with a single IN query.
+
+    The results seed the per-request cache used by validate_foreign_key(),
+    so validating each record of a batch afterwards costs no extra query.
+    """
+    fk_cache = getattr(request, '_android_api_fk_cache', None)
+    if fk_cache is None:
+        fk_cache = request._android_api_fk_cache = {}
+
+    ids = {
+        record_id for record_id in record_ids
+        if isinstance(record_id, int) and not isinstance(record_id, bool)
+        and (model, record_id) not in fk_cache
+    }
+    if not ids:
+        return
+
+    existing_ids = set(
+        request.env[model].sudo().with_context(active_test=False).browse(ids).exists().ids
+    )
+    for record_id in ids:
+        fk_cache[(model, record_id)] = record_id in existing_ids
+
+
+# Token bucket script: KEYS[1] = bucket hash, ARGV = capacity, refill rate
+# (tokens per second), current time, key TTL. Returns {allowed, retry_after}.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local last = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {allowed, math.ceil((1 - tokens) / rate)}
+"""
+
+
+def _get_redis():
+    """
+    Return a Redis client for shared rate limiting, or None when unavailable.
+
+    Configured through the 'android_api.redis_url' system parameter
+    (e.g. redis://localhost:6379/0). The client is created lazily and reused.
+    """
+    global _redis_client, _redis_url, _redis_token_bucket
+    if redis is None:
+        return None
+
+    url = request.env['ir.config_parameter'].sudo().get_param('android_api.redis_url')
+    if not url:
+        return None
+
+    if _redis_client is None or url != _redis_url:
+        _redis_client = redis.Redis.from_url(
+            url,
+            socket_timeout=REDIS_TIMEOUT,
+            socket_connect_timeout=REDIS_TIMEOUT,
+        )
+        _redis_token_bucket = _redis_client.register_script(_TOKEN_BUCKET_LUA)
+        _redis_url = url
+    return _redis_client
+
+
+def _rate_limit_error(retry_after):
+    """Create the HTTP 429 response returned when a client exceeds its limit."""
+    return json_error(
+        "Rate limit exceeded",
+        status=429,
+        details={
+            "limit": RATE_LIMIT_REQUESTS,
+            "window_seconds": RATE_LIMIT_WINDOW,
+            "retry_after": retry_after,
+        }
+    )
+
+
+def _check_rate_limit_redis(client_id, current_time):
+    """
+    Token bucket rate limit shared by all workers. The bucket holds
+    RATE_LIMIT_REQUESTS tokens and refills at RATE_LIMIT_REQUESTS per
+    RATE_LIMIT_WINDOW; one EVALSHA refills, takes a token and reports
+    the wait time atomically.
+    Returns (is_allowed, error_response) tuple.
+    """
+    # Never store raw API keys in Redis
+    key = 'android_api:rate_limit:%s' % hashlib.sha256(client_id.encode('utf-8')).hexdigest()
+
+    allowed, retry_after = _redis_token_bucket(
+        keys=[key],
+        args=[RATE_LIMIT_REQUESTS, RATE_LIMIT_REQUESTS / RATE_LIMIT_WINDOW,
+              current_time, RATE_LIMIT_WINDOW],
+    )
+    if not allowed:
+        return False, _rate_limit_error(int(retry_after))
+
+    return True, None
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_rate_limit_bypass(param_value):
+    """
+    Parse the comma-separated rate limit bypass keys (memoized per value).
+    Returns the SHA-256 digests of the keys, so a presented key is matched
+    by its digest and the comparison reveals nothing about the raw keys.
+    """
+    return frozenset(
+        hashlib.sha256(key.strip().encode('utf-8')).digest()
+        for key in param_value.split(',') if key.strip()
+    )
+
+
 def check_rate_limit():
     """
     Check if the current request exceeds rate limits.
     Returns (is_allowed, error_response) tuple.
+
+    Uses Redis when configured so the limit holds across all Odoo workers,
+    otherwise (or when Redis is unreachable) falls back to in-process storage.
+
+    Requests without an Authorization header are not counted, and keys listed
+    in the 'android_api.ratelimit_bypass' system parameter (comma-separated)
+    are never limited.
     """
-    # Use API key or IP as identifier
-    api_key = request.httprequest.headers.get('Authorization', '')
-    client_id = api_key if api_key else request.httprequest.remote_addr
+    api_key = request.httprequest.headers.get('Authorization')
+    if not api_key:
+        return True, None  # Rejected by api_authenticate() right after
 
+    bypass_keys = _parse_rate_limit_bypass(
+        request.env['ir.config_parameter'].sudo().get_param('android_api.ratelimit_bypass', '')
+    )
+    if bypass_keys and hashlib.sha256(
+            api_key.replace('Bearer ', '').strip().encode('utf-8')).digest() in bypass_keys:
+        return True, None
+
+    client_id = api_key
     current_time = time.time()
-    window_start = current_time - RATE_LIMIT_WINDOW
 
-    # Clean old entries and get current count
-    if client_id in _rate_limit_store:
-        _rate_limit_store[client_id] = [
-            t for t in _rate_limit_store[client_id] if t > window_start
-        ]
-    else:
-        _rate_limit_store[client_id] = []
+    client = _get_redis()
+    if client is not None:
+        try:
+            return _check_rate_limit_redis(client_id, current_time)
+        except redis.RedisError:
+            _logger.warning("Redis rate limiting unavailable, falling back to in-process limits", exc_info=True)
 
-    request_count = len(_rate_limit_store[client_id])
+    # Fixed window counter: O(1) per request, stale windows are pruned
+    window = int(current_time // RATE_LIMIT_WINDOW)
+    if window != _rate_limit_swept_window:
+        _prune_rate_limit_counts(window)
+
+    key = (client_id, window)
+    request_count = _rate_limit_counts.get(key, 0)
 
     if request_count >= RATE_LIMIT_REQUESTS:
-        return False, json_error(
-            "Rate limit exceeded",
-            status=429,
-            details={
-                "limit": RATE_LIMIT_REQUESTS,
-                "window_seconds": RATE_LIMIT_WINDOW,
-                "retry_after": int(RATE_LIMIT_WINDOW - (current_time - _rate_limit_store[client_id][0]))
-            }
-        )
+        return False, _rate_limit_error(int((window + 1) * RATE_LIMIT_WINDOW - current_time))
 
-    _rate_limit_store[client_id].append(current_time)
+    if request_count:
+        _rate_limit_counts[key] = request_count + 1
+    else:
+        # A flood of distinct keys evicts the oldest counters instead of growing the dict
+        cache_put(_rate_limit_counts, key, 1, RATE_LIMIT_MAX_ENTRIES)
     return True, None
 
 
+def _prune_rate_limit_counts(current_window):
+    """
+    Drop in-process counters of windows that have already ended.
+    Runs once per window and only visits the ended counters, which come first.
+    """
+    global _rate_limit_swept_window
+    _rate_limit_swept_window = current_window
+    while _rate_limit_counts:
+        oldest = next(iter(_rate_limit_counts), None)
+        if oldest is None or oldest[1] >= current_window:
+            break
+        _rate_limit_counts.pop(oldest, None)
+
+
 def parse_datetime(date_str, format='%Y-%m-%dT%H:%M:%S'):
     """
     Parse a datetime string in ISO 8601 format.
     Returns (datetime_obj, error_response) tuple.
+
+    Timezone-aware values are converted to naive UTC, as Odoo expects.
     """
     if not date_str:
         return None, None
 
-    # Support multiple formats for flexibility
-    formats = [
-        '%Y-%m-%dT%H:%M:%S',  # ISO 8601
-        '%Y-%m-%dT%H:%M:%SZ',  # ISO 8601 with Z
-        '%Y-%m-%d %H:%M:%S',  # Legacy format
-        '%Y-%m-%d',  # Date only
-    ]
+    # Fast path: C-implemented ISO 8601 parser covers nearly all client input
+    try:
+        dt = datetime.fromisoformat(date_str[:-1] if date_str.endswith('Z') else date_str)
+    except ValueError:
+        pass
+    else:
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt, None
 
-    for fmt in formats:
+    for fmt in DATETIME_FORMATS:
         try:
             return datetime.strptime(date_str, fmt), None
         except ValueError:
@@ -198,55 +660,101 @@ def parse_datetime(date_str, format='%Y-%m-%dT%H:%M:%S'):
     )
 
 
-def format_datetime(dt):
-    """Format a datetime object to ISO 8601 string."""
+def parse_date(date_str):
+    """
+    Parse a date string in ISO 8601 format (YYYY-MM-DD).
+    Returns (date_obj, error_response) tuple.
+
+    Full datetime strings are accepted as well and truncated to their date.
+    """
+    if not date_str:
+        return None, None
+
+    # Fast path: plain dates skip the datetime parser entirely
+    try:
+        return date.fromisoformat(date_str), None
+    except (ValueError, TypeError):
+        pass
+
+    dt, error = parse_datetime(date_str)
+    return (dt.date() if dt else None), error
+
+
+def memoize_parser(parser):
+    """
+    Wrap a single-argument parser such as parse_date with a memo dict, for
+    a single request in which many records share the same dates.
+    """
+    cache = {}
+
+    def parse_cached(value):
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = parser(value)
+            return result
+
+    return parse_cached
+
+
+def _parse_filter_date(value):
+    value_date, _ = parse_date(value)
+    if not value_date:
+        raise ValueError(value)
+    return value_date
+
+
+def _parse_filter_datetime(value):
+    dt, _ = parse_datetime(value)
     if not dt:
-        return None
-    if isinstance(dt, str):
-        return dt
-    return dt.strftime('%Y-%m-%dT%H:%M:%S')
+        raise ValueError(value)
+    return dt
 
 
-def format_date(d):
-    """Format a date object to ISO 8601 string."""
-    if not d:
-        return None
-    if isinstance(d, str):
-        return d
-    return d.strftime('%Y-%m-%d')
+def _parse_filter_bool(value):
+    return value.lower() in ('true', '1', 'yes')
+
 
+_FILTER_CONVERTERS = {
+    'int': int,
+    'str': str,
+    'date': _parse_filter_date,
+    'datetime': _parse_filter_datetime,
+    'bool': _parse_filter_bool,
+}
 
-def get_filter_params(allowed_filters):
+
+def compile_filter_spec(allowed_filters):
     """
-    Extract filter parameters from query string.
-    Returns a dict of filter field -> value.
+    Compile an endpoint's allowed filters once, at import time.
+    Returns a tuple of (param_name, odoo_field, converter) entries.
 
     allowed_filters: dict of {param_name: (odoo_field, type)}
     type can be: 'int', 'str', 'date', 'datetime', 'bool'
     """
+    return tuple(
+        (param, field, _FILTER_CONVERTERS[field_type])
+        for param, (field, field_type) in allowed_filters.items()
+    )
+
+
+def get_filter_params(filter_spec):
+    """
+    Extract filter parameters from query string.
+    Returns a dict of filter field -> value.
+
+    filter_spec: compiled filters, see compile_filter_spec()
+    """
     filters = {}
     args = request.httprequest.args
 
-    for param, (field, field_type) in allowed_filters.items():
+    for param, field, convert in filter_spec:
         value = args.get(param)
         if value is None:
             continue
 
         try:
-            if field_type == 'int':
-                filters[field] = int(value)
-            elif field_type == 'str':
-                filters[field] = value
-            elif field_type == 'date':
-                dt, _ = parse_datetime(value)
-                if dt:
-                    filters[field] = dt.date()
-            elif field_type == 'datetime':
-                dt, _ = parse_datetime(value)
-                if dt:
-                    filters[field] = dt
-            elif field_type == 'bool':
-                filters[field] = value.lower() in ('true', '1', 'yes')
+            filters[field] = convert(value)
         except (ValueError, TypeError):
             pass  # Skip invalid filter values
 
@@ -261,3 +769,26 @@ def build_domain(base_domain, filters):
     for field, value in filters.items():
         domain.append((field, '=', value))
     return domain
+
+
+def search_with_count(model, domain, limit, offset, order='id', count=True):
+    """
+    Search one page of records together with the total number of matches,
+    using COUNT(*) OVER () so a single query replaces search_count + search.
+    Returns (records, total) tuple; total is None when count is False.
+    """
+    if not count:
+        return model.search(domain, limit=limit, offset=offset, order=order), None
+
+    query = model._search(domain, offset=offset, limit=limit, order=order)
+    if query.is_empty():
+        return model.browse(), 0
+
+    rows = model.env.execute_query(query.select(
+        SQL.identifier(model._table, 'id'),
+        SQL('COUNT(*) OVER ()'),
+    ))
+    if not rows:
+        # Offset is past the last match: the window count is unavailable
+        return model.browse(), model.search_count(domain)
+    return model.browse([row[0] for row in rows]), rows[0][1]
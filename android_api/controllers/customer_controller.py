@@ -1,24 +1,58 @@
 # -*- coding: utf-8 -*-
 
 from odoo import http
+from odoo.exceptions import UserError
 from odoo.http import request
+from odoo.tools import split_every
+from psycopg2 import IntegrityError
 
 import logging
 
 from .auth import (
-    api_authenticate, get_pagination_params, json_error, paginated_response,
-    json_response, validate_required_fields, check_rate_limit,
-    format_date, format_datetime, parse_datetime, get_filter_params, build_domain
+    api_authenticate, get_pagination_params, json_error, json_response,
+    validate_required_fields, check_rate_limit, parse_date, get_filter_params,
+    build_domain, compile_filter_spec, unauthorized_response, search_with_count,
+    memoize_parser, get_json_body, paginated_chunks_response, encode_rows,
+    PAGINATION_CHUNK_SIZE, validate_records_are_objects, get_after_id,
+    get_count_param
 )
 
 _logger = logging.getLogger(__name__)
 
+# Fields required for each record in POST /customer
+REQUIRED_FIELDS = ['mobile_uid', 'name']
+
+# Fields fetched when serializing partners
+PARTNER_READ_FIELDS = [
+    'mobile_uid', 'name', 'city', 'vat', 'email', 'phone', 'website',
+    'partner_latitude', 'partner_longitude', 'mobile_sync_date', 'write_date',
+]
+
+# (odoo_field, payload_key) pairs copied as-is into partner vals when set
+PARTNER_VALS_KEYS = (
+    ('name', 'name'),
+    ('mobile_uid', 'mobile_uid'),
+    ('city', 'city'),
+    ('vat', 'tax_id'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('website', 'website'),
+    ('partner_latitude', 'partner_latitude'),
+    ('partner_longitude', 'partner_longitude'),
+)
+
+# Values every partner created or updated through the API gets
+PARTNER_DEFAULT_VALS = {
+    'is_company': True,
+    'customer_rank': 1,
+}
+
 # Allowed filters for GET endpoint
-CUSTOMER_FILTERS = {
+CUSTOMER_FILTER_SPEC = compile_filter_spec({
     'city': ('city', 'str'),
     'email': ('email', 'str'),
     'since': ('write_date', 'datetime'),  # Records modified since
-}
+})
 
 
 class CustomerController(http.Controller):
@@ -31,11 +65,11 @@ class CustomerController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
             limit, offset = get_pagination_params()
-            filters = get_filter_params(CUSTOMER_FILTERS)
+            filters = get_filter_params(CUSTOMER_FILTER_SPEC)
 
             partners_env = request.env['res.partner'].sudo().with_context(active_test=False)
 
@@ -43,7 +77,7 @@ class CustomerController(http.Controller):
             base_domain = [
                 '|', '|',
                 ('customer_rank', '>', 0),
-                ('sale_order_ids', '!=', False),
+                ('has_sale_orders', '=', True),
                 ('mobile_uid', '!=', False),
             ]
 
@@ -55,20 +89,30 @@ class CustomerController(http.Controller):
                     domain = domain + [('write_date', '>=', filters.pop('write_date'))]
                 domain = build_domain(domain, filters)
 
-            # Get total count for pagination
-            total = partners_env.search_count(domain)
-
-            # Get paginated results
-            customers = partners_env.search(domain, limit=limit, offset=offset, order='id')
-
-            result = [self.__partner_to_dict(partner) for partner in customers]
+            # Keyset pagination: continue after the last id of the previous page
+            after_id = get_after_id()
+            if after_id:
+                domain = domain + [('id', '>', after_id)]
+                offset = 0
+
+            # Get paginated results and total count in one query
+            customers, total = search_with_count(
+                partners_env, domain, limit, offset, count=get_count_param())
+
+            # Read and encode one chunk at a time so the page never exists as
+            # a full list of dicts next to its JSON bytes
+            chunks = [
+                encode_rows(self.__partners_to_dicts(batch))
+                for batch in split_every(PAGINATION_CHUNK_SIZE, customers.ids, customers.browse)
+            ]
 
-            _logger.info(f'GET /customer - Returned {len(result)} of {total} customers')
-            return paginated_response(result, total, limit, offset)
+            _logger.info('GET /customer - Returned %s of %s customers', len(customers), total)
+            return paginated_chunks_response(
+                chunks, total, limit, offset, len(customers), customers.ids[-1] if customers else None)
 
-        except Exception as exp:
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
+            return json_error("Internal server error", status=500)
 
     @http.route('/customer', type='http', auth='none', methods=['POST'], cors='*', csrf=False)
     def create_customers(self):
@@ -78,10 +122,12 @@ class CustomerController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
-            payload = request.httprequest.json
+            payload, error = get_json_body()
+            if error:
+                return error
 
             if not isinstance(payload, list):
                 return json_error("Request body must be a JSON array")
@@ -92,74 +138,122 @@ class CustomerController(http.Controller):
             if len(payload) > 100:
                 return json_error("Batch size cannot exceed 100 records")
 
+            valid, error = validate_records_are_objects(payload)
+            if not valid:
+                return error
+
             partners_env = request.env['res.partner'].sudo().with_context(active_test=False)
-            created_customers = []
+
+            # Bind callables used in the batch loops once
+            validate = validate_required_fields
+            to_partner_vals = self.__dict_to_partner_vals
+            # Batches from one device mostly share a handful of sync dates
+            parse_sync_date = memoize_parser(parse_date)
 
             # Use savepoint for transaction handling
             with request.env.cr.savepoint():
                 for idx, customer_data in enumerate(payload):
                     # Validate required fields
-                    valid, error = validate_required_fields(customer_data, ['mobile_uid', 'name'])
+                    valid, error = validate(customer_data, REQUIRED_FIELDS)
                     if not valid:
                         error_data = {"error": "Validation failed", "index": idx, "details": customer_data.get('mobile_uid', f'item_{idx}')}
                         return json_error(f"Validation failed at index {idx}", details=error_data)
 
-                    mobile_uid = customer_data.get('mobile_uid')
-                    partner_vals = self.__dict_to_partner_vals(customer_data)
-
-                    partner = partners_env.search([('mobile_uid', '=', mobile_uid)], limit=1)
+                # Fetch all existing partners in one query instead of one per record
+                mobile_uids = [customer_data['mobile_uid'] for customer_data in payload]
+                partners_by_uid = {
+                    partner.mobile_uid: partner
+                    for partner in partners_env.search([('mobile_uid', 'in', mobile_uids)])
+                }
+
+                # Update existing partners, collect new ones for a single batch create
+                create_vals = {}
+                updated_count = 0
+                get_partner = partners_by_uid.get
+                for customer_data in payload:
+                    mobile_uid = customer_data['mobile_uid']
+                    partner_vals = to_partner_vals(customer_data, parse_sync_date)
+
+                    partner = get_partner(mobile_uid)
                     if partner:
                         partner_vals.pop('mobile_uid', None)
                         partner.write(partner_vals)
-                        _logger.info(f'Customer {partner.id} updated')
+                        updated_count += 1
+                    elif mobile_uid in create_vals:
+                        # Duplicate within the batch: later values win
+                        create_vals[mobile_uid].update(partner_vals)
                     else:
-                        partner = partners_env.create(partner_vals)
-                        _logger.info(f'Customer {partner.id} created')
-
-                    created_customers.append(self.__partner_to_dict(partner))
-
+                        create_vals[mobile_uid] = partner_vals
+
+                if create_vals:
+                    new_partners = partners_env.create(list(create_vals.values()))
+                    partners_by_uid.update(zip(create_vals, new_partners))
+
+                # Serialize all touched partners with a single read()
+                partners = partners_env.browse([partner.id for partner in partners_by_uid.values()])
+                dicts_by_uid = dict(zip(partners_by_uid, self.__partners_to_dicts(partners)))
+                created_customers = [
+                    dicts_by_uid[customer_data['mobile_uid']] for customer_data in payload
+                ]
+
+            # One summary line per batch instead of one log call per record
+            _logger.info('POST /customer - Created %s and updated %s customers',
+                         len(create_vals), updated_count)
             return json_response({"count": len(created_customers), "data": created_customers})
 
-        except Exception as exp:
+        except IntegrityError:
+            # A concurrent request created one of the mobile_uids after our lookup.
+            # The savepoint rolled the whole batch back; a retry will update instead.
+            _logger.warning('POST /customer - mobile_uid conflict, batch rolled back', exc_info=True)
+            return json_error(
+                "Conflicting mobile_uid, records were created concurrently",
+                status=409,
+                details={"retry": True}
+            )
+
+        except UserError as exp:
+            # Business rule or constraint violated by the submitted data
+            _logger.warning('API validation error: %s', exp)
+            return json_error("Validation failed", details={"message": str(exp)})
+
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
-
-    def __partner_to_dict(self, partner):
-        return {
-            'id': partner.id,
-            'mobile_uid': partner.mobile_uid or '',
-            'name': partner.name or '',
-            'city': partner.city or None,
-            'tax_id': partner.vat or None,
-            'email': partner.email or None,
-            'phone': partner.phone or None,
-            'website': partner.website or None,
-            'partner_latitude': partner.partner_latitude or None,
-            'partner_longitude': partner.partner_longitude or None,
-            'mobile_sync_date': format_date(partner.mobile_sync_date),
-            'write_date': format_datetime(partner.write_date) if partner.write_date else None,
-        }
-
-    def __dict_to_partner_vals(self, data):
-        vals = {
-            'name': data.get('name'),
-            'mobile_uid': data.get('mobile_uid'),
-            'city': data.get('city'),
-            'vat': data.get('tax_id'),
-            'email': data.get('email'),
-            'phone': data.get('phone'),
-            'website': data.get('website'),
-            'partner_latitude': data.get('partner_latitude'),
-            'partner_longitude': data.get('partner_longitude'),
-            'is_company': True,
-            'customer_rank': 1,
-        }
+            return json_error("Internal server error", status=500)
+
+    def __partners_to_dicts(self, partners):
+        """
+        Serialize a partner recordset using a single batched read().
+
+        The rows returned by read() are converted in place rather than copied
+        into new dicts, which saves one dict allocation per partner.
+        """
+        rows = partners.read(PARTNER_READ_FIELDS)
+        for row in rows:
+            row['mobile_uid'] = row['mobile_uid'] or ''
+            row['name'] = row['name'] or ''
+            row['city'] = row['city'] or None
+            row['tax_id'] = row.pop('vat') or None
+            row['email'] = row['email'] or None
+            row['phone'] = row['phone'] or None
+            row['website'] = row['website'] or None
+            row['partner_latitude'] = row['partner_latitude'] or None
+            row['partner_longitude'] = row['partner_longitude'] or None
+            row['mobile_sync_date'] = row['mobile_sync_date'] or None
+            row['write_date'] = row['write_date'] or None
+        return rows
+
+    def __dict_to_partner_vals(self, data, parse=parse_date):
+        vals = PARTNER_DEFAULT_VALS.copy()
+        for field, key in PARTNER_VALS_KEYS:
+            value = data.get(key)
+            if value is not None:
+                vals[field] = value
 
         # Parse date (supports ISO 8601)
         date_str = data.get('mobile_sync_date') or data.get('date')  # Support both field names
         if date_str:
-            dt, _ = parse_datetime(date_str)
-            if dt:
-                vals['mobile_sync_date'] = dt.date() if hasattr(dt, 'date') else dt
+            value_date, _ = parse(date_str)
+            if value_date:
+                vals['mobile_sync_date'] = value_date
 
-        return {k: v for k, v in vals.items() if v is not None}
+        return vals
@@ -1,25 +1,34 @@
 # -*- coding: utf-8 -*-
 
 from odoo import http
+from odoo.exceptions import UserError
 from odoo.http import request
 
 import logging
 
 from .auth import (
     api_authenticate, get_pagination_params, json_error, json_response,
-    paginated_response, check_rate_limit, format_datetime, get_filter_params,
-    build_domain
+    paginated_response, check_rate_limit, get_filter_params, build_domain,
+    compile_filter_spec, unauthorized_response, get_json_body, search_with_count,
+    get_after_id, get_count_param
 )
 
 _logger = logging.getLogger(__name__)
 
+# Fields fetched when serializing deliveries (many2one fields are read as ids)
+PICKING_READ_FIELDS = [
+    'name', 'partner_id', 'scheduled_date', 'state', 'sale_id', 'write_date',
+    'move_ids_without_package',
+]
+MOVE_READ_FIELDS = ['product_id', 'product_uom_qty', 'quantity', 'product_uom']
+
 # Allowed filters for GET endpoint
-DELIVERY_FILTERS = {
+DELIVERY_FILTER_SPEC = compile_filter_spec({
     'partner_id': ('partner_id', 'int'),
     'sale_id': ('sale_id', 'int'),
     'state': ('state', 'str'),
     'since': ('write_date', 'datetime'),  # Records modified since
-}
+})
 
 
 class DeliveryController(http.Controller):
@@ -32,11 +41,11 @@ class DeliveryController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
             limit, offset = get_pagination_params()
-            filters = get_filter_params(DELIVERY_FILTERS)
+            filters = get_filter_params(DELIVERY_FILTER_SPEC)
 
             pickings_env = request.env['stock.picking'].sudo()
 
@@ -50,43 +59,56 @@ class DeliveryController(http.Controller):
                     domain.append(('write_date', '>=', filters.pop('write_date')))
                 domain = build_domain(domain, filters)
 
-            # Get total count for pagination
-            total = pickings_env.search_count(domain)
+            # Keyset pagination: continue after the last id of the previous page
+            after_id = get_after_id()
+            if after_id:
+                domain = domain + [('id', '>', after_id)]
+                offset = 0
 
-            # Get paginated results
-            pickings = pickings_env.search(domain, limit=limit, offset=offset, order='id')
+            # Get paginated results and total count in one query
+            pickings, total = search_with_count(
+                pickings_env, domain, limit, offset, count=get_count_param())
 
-            result = [self.__picking_to_dict(picking) for picking in pickings]
+            result = self.__pickings_to_dicts(pickings)
 
-            _logger.info(f'GET /deliveries - Returned {len(result)} of {total} deliveries')
-            return paginated_response(result, total, limit, offset)
+            _logger.info('GET /deliveries - Returned %s of %s deliveries', len(result), total)
+            return paginated_response(result, total, limit, offset, pickings.ids[-1] if pickings else None)
 
-        except Exception as exp:
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
-
-    def __picking_to_dict(self, picking):
-        lines = []
-        for move in picking.move_ids_without_package:
-            lines.append({
-                'id': move.id,
-                'product_id': move.product_id.id if move.product_id else None,
-                'product_name': move.product_id.name if move.product_id else '',
-                'quantity': move.product_uom_qty,
-                'quantity_done': move.quantity,
-                'uom': move.product_uom.name if move.product_uom else '',
-            })
-
-        return {
-            'id': picking.id,
-            'name': picking.name or '',
-            'partner_id': picking.partner_id.id if picking.partner_id else None,
-            'scheduled_date': format_datetime(picking.scheduled_date),
-            'state': picking.state or '',
-            'sale_id': picking.sale_id.id if picking.sale_id else None,
-            'write_date': format_datetime(picking.write_date) if picking.write_date else None,
-            'lines': lines,
-        }
+            return json_error("Internal server error", status=500)
+
+    def __pickings_to_dicts(self, pickings):
+        """Serialize pickings and their move lines using batched read() calls."""
+        picking_rows = pickings.read(PICKING_READ_FIELDS, load=None)
+
+        # Fetch the moves of all pickings, then their product and uom names, at once
+        moves = pickings.env['stock.move'].browse([
+            move_id for row in picking_rows for move_id in row['move_ids_without_package']
+        ])
+        move_rows = moves.read(MOVE_READ_FIELDS, load=None)
+        product_names = {row['id']: row['name'] for row in moves.product_id.read(['name'])}
+        uom_names = {row['id']: row['name'] for row in moves.product_uom.read(['name'])}
+
+        lines_by_move = {row['id']: {
+            'id': row['id'],
+            'product_id': row['product_id'] or None,
+            'product_name': product_names.get(row['product_id'], ''),
+            'quantity': row['product_uom_qty'],
+            'quantity_done': row['quantity'],
+            'uom': uom_names.get(row['product_uom'], ''),
+        } for row in move_rows}
+
+        return [{
+            'id': row['id'],
+            'name': row['name'] or '',
+            'partner_id': row['partner_id'] or None,
+            'scheduled_date': row['scheduled_date'] or None,
+            'state': row['state'] or '',
+            'sale_id': row['sale_id'] or None,
+            'write_date': row['write_date'] or None,
+            'lines': [lines_by_move[move_id] for move_id in row['move_ids_without_package']],
+        } for row in picking_rows]
 
     @http.route('/deliveries', type='http', auth='none', methods=['POST'], cors='*', csrf=False)
     def update_delivery_status(self):
@@ -97,10 +119,16 @@ class DeliveryController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
-            params = request.httprequest.json
+            params, error = get_json_body()
+            if error:
+                return error
+
+            if not isinstance(params, dict):
+                return json_error("Request body must be a JSON object")
+
             delivery_id = params.get('id')
 
             if not delivery_id:
@@ -124,9 +152,14 @@ class DeliveryController(http.Controller):
             # Validate the picking (mark as done)
             picking.button_validate()
 
-            _logger.info(f'POST /deliveries - Marked delivery {delivery_id} as done')
-            return json_response({'success': True, 'delivery': self.__picking_to_dict(picking)})
+            _logger.info('POST /deliveries - Marked delivery %s as done', delivery_id)
+            return json_response({'success': True, 'delivery': self.__pickings_to_dicts(picking)[0]})
+
+        except UserError as exp:
+            # Business rule or constraint violated by the submitted data
+            _logger.warning('API validation error: %s', exp)
+            return json_error("Validation failed", details={"message": str(exp)})
 
-        except Exception as exp:
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
\ No newline at end of file
+            return json_error("Internal server error", status=500)
\ No newline at end of file
@@ -1,25 +1,45 @@
 # -*- coding: utf-8 -*-
 
 from odoo import http
+from odoo.exceptions import UserError
 from odoo.http import request
 
 import logging
 
 from .auth import (
     api_authenticate, json_error, json_response, validate_required_fields,
-    validate_foreign_key, check_rate_limit, format_date, parse_datetime,
-    get_pagination_params, get_filter_params, build_domain, paginated_response,
-    format_datetime
+    validate_foreign_key, check_rate_limit, parse_date, get_pagination_params,
+    get_filter_params, build_domain, paginated_response, compile_filter_spec,
+    unauthorized_response, get_json_body, prefetch_foreign_keys, search_with_count,
+    validate_records_are_objects, memoize_parser, get_after_id, get_count_param
 )
 
 _logger = logging.getLogger(__name__)
 
+# Fields required for each record in POST /payments
+REQUIRED_FIELDS = ['mobile_uid', 'partner_id', 'amount']
+
+# Fields fetched when serializing payments (many2one fields are read as ids)
+PAYMENT_READ_FIELDS = [
+    'mobile_uid', 'name', 'partner_id', 'amount', 'date', 'memo', 'journal_id',
+    'state', 'write_date',
+]
+
+# Payload keys copied as-is into payment vals when set
+PAYMENT_VALS_KEYS = ('mobile_uid', 'partner_id', 'amount')
+
+# Values every payment created or updated through the API gets
+PAYMENT_DEFAULT_VALS = {
+    'payment_type': 'inbound',
+    'partner_type': 'customer',
+}
+
 # Allowed filters for GET endpoint
-PAYMENT_FILTERS = {
+PAYMENT_FILTER_SPEC = compile_filter_spec({
     'partner_id': ('partner_id', 'int'),
     'state': ('state', 'str'),
     'since': ('write_date', 'datetime'),  # Records modified since
-}
+})
 
 
 class PaymentController(http.Controller):
@@ -32,11 +52,11 @@ class PaymentController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
             limit, offset = get_pagination_params()
-            filters = get_filter_params(PAYMENT_FILTERS)
+            filters = get_filter_params(PAYMENT_FILTER_SPEC)
 
             payments_env = request.env['account.payment'].sudo()
 
@@ -50,20 +70,24 @@ class PaymentController(http.Controller):
                     domain.append(('write_date', '>=', filters.pop('write_date')))
                 domain = build_domain(domain, filters)
 
-            # Get total count for pagination
-            total = payments_env.search_count(domain)
+            # Keyset pagination: continue after the last id of the previous page
+            after_id = get_after_id()
+            if after_id:
+                domain = domain + [('id', '>', after_id)]
+                offset = 0
 
-            # Get paginated results
-            payments = payments_env.search(domain, limit=limit, offset=offset, order='id')
+            # Get paginated results and total count in one query
+            payments, total = search_with_count(
+                payments_env, domain, limit, offset, count=get_count_param())
 
-            result = [self.__payment_to_dict(payment) for payment in payments]
+            result = self.__payments_to_dicts(payments)
 
-            _logger.info(f'GET /payments - Returned {len(result)} of {total} payments')
-            return paginated_response(result, total, limit, offset)
+            _logger.info('GET /payments - Returned %s of %s payments', len(result), total)
+            return paginated_response(result, total, limit, offset, payments.ids[-1] if payments else None)
 
-        except Exception as exp:
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
+            return json_error("Internal server error", status=500)
 
     @http.route('/payments', type='http', auth='none', methods=['POST'], cors='*', csrf=False)
     def create_payments(self):
@@ -73,10 +97,12 @@ class PaymentController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
-            payload = request.httprequest.json
+            payload, error = get_json_body()
+            if error:
+                return error
 
             if not isinstance(payload, list):
                 return json_error("Request body must be a JSON array")
@@ -87,14 +113,21 @@ class PaymentController(http.Controller):
             if len(payload) > 100:
                 return json_error("Batch size cannot exceed 100 records")
 
+            valid, error = validate_records_are_objects(payload)
+            if not valid:
+                return error
+
             payments_env = request.env['account.payment'].sudo()
-            created_payments = []
 
             # Use savepoint for transaction handling
             with request.env.cr.savepoint():
+                # Check all partner and journal references with one query per model
+                prefetch_foreign_keys('res.partner', [payment_data.get('partner_id') for payment_data in payload])
+                prefetch_foreign_keys('account.journal', [payment_data.get('journal_id') for payment_data in payload])
+
                 for idx, payment_data in enumerate(payload):
                     # Validate required fields
-                    valid, error = validate_required_fields(payment_data, ['mobile_uid', 'partner_id', 'amount'])
+                    valid, error = validate_required_fields(payment_data, REQUIRED_FIELDS)
                     if not valid:
                         return json_error(f"Validation failed at index {idx}", details={"mobile_uid": payment_data.get('mobile_uid', f'item_{idx}')})
 
@@ -108,71 +141,112 @@ class PaymentController(http.Controller):
                         if not valid:
                             return error
 
-                    mobile_uid = payment_data.get('mobile_uid')
-                    payment_vals = self.__dict_to_payment_vals(payment_data)
-
-                    payment = payments_env.search([('mobile_uid', '=', mobile_uid)], limit=1)
+                # Fetch all existing payments in one query instead of one per record
+                mobile_uids = [payment_data['mobile_uid'] for payment_data in payload]
+                payments_by_uid = {
+                    payment.mobile_uid: payment
+                    for payment in payments_env.search([('mobile_uid', 'in', mobile_uids)])
+                }
+
+                # Find the default bank journal once, only if some payment needs it
+                default_journal_id = None
+                if not all(payment_data.get('journal_id') for payment_data in payload):
+                    default_journal_id = request.env['account.journal'].sudo().search([
+                        ('type', '=', 'bank'),
+                        ('company_id', '=', request.env.company.id),
+                    ], limit=1).id or None
+
+                # Update existing payments, collect new ones for a single batch create
+                create_vals = {}
+                updated_count = 0
+                parse_payment_date = memoize_parser(parse_date)
+                for payment_data in payload:
+                    mobile_uid = payment_data['mobile_uid']
+                    payment_vals = self.__dict_to_payment_vals(payment_data, default_journal_id, parse_payment_date)
+
+                    payment = payments_by_uid.get(mobile_uid)
                     if payment:
                         payment_vals.pop('mobile_uid', None)
                         payment.write(payment_vals)
-                        _logger.info(f'Payment {payment.id} updated')
+                        updated_count += 1
+                    elif mobile_uid in create_vals:
+                        # Duplicate within the batch: later values win
+                        create_vals[mobile_uid].update(payment_vals)
                     else:
-                        payment = payments_env.create(payment_vals)
-                        _logger.info(f'Payment {payment.id} created')
-
-                    created_payments.append(self.__payment_to_dict(payment))
-
+                        create_vals[mobile_uid] = payment_vals
+
+                if create_vals:
+                    new_payments = payments_env.create(list(create_vals.values()))
+                    payments_by_uid.update(zip(create_vals, new_payments))
+
+                # Serialize all touched payments with a single read()
+                payments = payments_env.browse([payment.id for payment in payments_by_uid.values()])
+                dicts_by_uid = dict(zip(payments_by_uid, self.__payments_to_dicts(payments)))
+                created_payments = [
+                    dicts_by_uid[payment_data['mobile_uid']] for payment_data in payload
+                ]
+
+            # One summary line per batch instead of one log call per record
+            _logger.info('POST /payments - Created %s and updated %s payments',
+                         len(create_vals), updated_count)
             return json_response({"count": len(created_payments), "data": created_payments})
 
-        except Exception as exp:
+        except UserError as exp:
+            # Business rule or constraint violated by the submitted data
+            _logger.warning('API validation error: %s', exp)
+            return json_error("Validation failed", details={"message": str(exp)})
+
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
-
-    def __payment_to_dict(self, payment):
-        return {
-            'id': payment.id,
-            'mobile_uid': payment.mobile_uid or '',
-            'name': payment.name or '',
-            'partner_id': payment.partner_id.id if payment.partner_id else None,
-            'amount': payment.amount,
-            'date': format_date(payment.date),
-            'memo': payment.memo or '',
-            'journal_id': payment.journal_id.id if payment.journal_id else None,
-            'state': payment.state or '',
-            'write_date': format_datetime(payment.write_date) if payment.write_date else None,
-        }
-
-    def __dict_to_payment_vals(self, data):
-        vals = {
-            'mobile_uid': data.get('mobile_uid'),
-            'partner_id': data.get('partner_id'),
-            'amount': data.get('amount'),
-            'payment_type': 'inbound',
-            'partner_type': 'customer',
-        }
-
-        # Use provided journal_id or find default bank journal
-        journal_id = data.get('journal_id')
+            return json_error("Internal server error", status=500)
+
+    def __payments_to_dicts(self, payments):
+        """
+        Serialize a payment recordset using a single batched read().
+
+        The rows returned by read() are converted in place rather than copied
+        into new dicts, which saves one dict allocation per payment.
+        """
+        rows = payments.read(PAYMENT_READ_FIELDS, load=None)
+        for row in rows:
+            row['mobile_uid'] = row['mobile_uid'] or ''
+            row['name'] = row['name'] or ''
+            row['partner_id'] = row['partner_id'] or None
+            row['date'] = row['date'] or None
+            row['memo'] = row['memo'] or ''
+            row['journal_id'] = row['journal_id'] or None
+            row['state'] = row['state'] or ''
+            row['write_date'] = row['write_date'] or None
+        return rows
+
+    def __dict_to_payment_vals(self, data, default_journal_id=None, parse=parse_date):
+        """Convert request data to Odoo field values.
+
+        Args:
+            data: The request data dictionary
+            default_journal_id: Journal used when data has no journal_id
+            parse: Date parser, e.g. a memoize_parser(parse_date) shared by the batch
+        """
+        vals = PAYMENT_DEFAULT_VALS.copy()
+        for key in PAYMENT_VALS_KEYS:
+            value = data.get(key)
+            if value is not None:
+                vals[key] = value
+
+        # Use provided journal_id or the default bank journal
+        journal_id = data.get('journal_id') or default_journal_id
         if journal_id:
             vals['journal_id'] = journal_id
-        else:
-            # Find a bank journal that accepts inbound payments
-            bank_journal = request.env['account.journal'].sudo().search([
-                ('type', '=', 'bank'),
-                ('company_id', '=', request.env.company.id),
-            ], limit=1)
-            if bank_journal:
-                vals['journal_id'] = bank_journal.id
 
         # Parse date (supports ISO 8601)
         date_str = data.get('date')
         if date_str:
-            dt, _ = parse_datetime(date_str)
-            if dt:
-                vals['date'] = dt.date() if hasattr(dt, 'date') else dt
+            value_date, _ = parse(date_str)
+            if value_date:
+                vals['date'] = value_date
 
         memo = data.get('memo')
         if memo:
             vals['memo'] = memo
 
-        return {k: v for k, v in vals.items() if v is not None}
+        return vals
@@ -7,18 +7,25 @@ import logging
 
 from .auth import (
     api_authenticate, get_pagination_params, json_error, paginated_response,
-    check_rate_limit, get_filter_params, build_domain
+    check_rate_limit, get_filter_params, compile_filter_spec, build_domain,
+    unauthorized_response, search_with_count, get_after_id, get_count_param
 )
 
 _logger = logging.getLogger(__name__)
 
+# Fields fetched when serializing products (many2one fields are read as ids)
+PRODUCT_READ_FIELDS = [
+    'name', 'default_code', 'barcode', 'list_price', 'uom_id', 'categ_id',
+    'type', 'active',
+]
+
 # Allowed filters for GET endpoint
-PRODUCT_FILTERS = {
+PRODUCT_FILTER_SPEC = compile_filter_spec({
     'category_id': ('categ_id', 'int'),
     'type': ('type', 'str'),
     'active': ('active', 'bool'),
     'since': ('write_date', 'datetime'),  # Records modified since
-}
+})
 
 
 class ProductController(http.Controller):
@@ -31,11 +38,11 @@ class ProductController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
             limit, offset = get_pagination_params()
-            filters = get_filter_params(PRODUCT_FILTERS)
+            filters = get_filter_params(PRODUCT_FILTER_SPEC)
 
             products_env = request.env['product.product'].sudo()
 
@@ -49,32 +56,43 @@ class ProductController(http.Controller):
                     domain.append(('write_date', '>=', filters.pop('write_date')))
                 domain = build_domain(domain, filters)
 
-            # Get total count for pagination
-            total = products_env.search_count(domain)
+            # Keyset pagination: continue after the last id of the previous page
+            after_id = get_after_id()
+            if after_id:
+                domain = domain + [('id', '>', after_id)]
+                offset = 0
 
-            # Get paginated results
-            products = products_env.search(domain, limit=limit, offset=offset, order='id')
+            # Get paginated results and total count in one query
+            products, total = search_with_count(
+                products_env, domain, limit, offset, count=get_count_param())
 
-            result = [self.__product_to_dict(product) for product in products]
+            result = self.__products_to_dicts(products)
 
-            _logger.info(f'GET /products - Returned {len(result)} of {total} products')
-            return paginated_response(result, total, limit, offset)
+            _logger.info('GET /products - Returned %s of %s products', len(result), total)
+            return paginated_response(result, total, limit, offset, products.ids[-1] if products else None)
 
-        except Exception as exp:
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
-
-    def __product_to_dict(self, product):
-        return {
-            'id': product.id,
-            'name': product.name or '',
-            'default_code': product.default_code or None,  # SKU
-            'barcode': product.barcode or None,
-            'list_price': product.list_price,
-            'uom_id': product.uom_id.id if product.uom_id else None,
-            'uom_name': product.uom_id.name if product.uom_id else None,
-            'categ_id': product.categ_id.id if product.categ_id else None,
-            'categ_name': product.categ_id.name if product.categ_id else None,
-            'type': product.type or 'consu',  # consu, service, product
-            'active': product.active,
-        }
+            return json_error("Internal server error", status=500)
+
+    def __products_to_dicts(self, products):
+        """Serialize a product recordset using batched read() calls."""
+        rows = products.read(PRODUCT_READ_FIELDS, load=None)
+
+        # Fetch the uom and category names of the whole page at once
+        uom_names = {row['id']: row['name'] for row in products.uom_id.read(['name'])}
+        categ_names = {row['id']: row['name'] for row in products.categ_id.read(['name'])}
+
+        return [{
+            'id': row['id'],
+            'name': row['name'] or '',
+            'default_code': row['default_code'] or None,  # SKU
+            'barcode': row['barcode'] or None,
+            'list_price': row['list_price'],
+            'uom_id': row['uom_id'] or None,
+            'uom_name': uom_names.get(row['uom_id']),
+            'categ_id': row['categ_id'] or None,
+            'categ_name': categ_names.get(row['categ_id']),
+            'type': row['type'] or 'consu',  # consu, service, product
+            'active': row['active'],
+        } for row in rows]
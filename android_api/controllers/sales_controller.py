@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from odoo import http
+from odoo.exceptions import UserError
 from odoo.http import request
 
 import logging
@@ -8,17 +9,33 @@ import logging
 from .auth import (
     api_authenticate, get_pagination_params, json_error, paginated_response,
     json_response, validate_required_fields, validate_foreign_key, check_rate_limit,
-    format_datetime, parse_datetime, get_filter_params, build_domain
+    parse_datetime, get_filter_params, build_domain, compile_filter_spec,
+    unauthorized_response, get_json_body, validate_records_are_objects,
+    search_with_count, get_after_id, prefetch_foreign_keys, get_count_param
 )
 
 _logger = logging.getLogger(__name__)
 
+# Fields required for each record in POST /sales
+REQUIRED_FIELDS = ['mobile_uid', 'partner_id']
+
+# Fields fetched when serializing sale orders and their lines
+# (many2one fields are read as ids)
+SALE_ORDER_READ_FIELDS = [
+    'mobile_uid', 'name', 'date_order', 'amount_total', 'state', 'partner_id',
+    'write_date', 'order_line',
+]
+SALE_LINE_READ_FIELDS = [
+    'product_id', 'product_uom_qty', 'qty_delivered', 'qty_invoiced',
+    'price_unit', 'discount', 'price_subtotal', 'product_uom',
+]
+
 # Allowed filters for GET endpoint
-SALES_FILTERS = {
+SALES_FILTER_SPEC = compile_filter_spec({
     'partner_id': ('partner_id', 'int'),
     'state': ('state', 'str'),
     'since': ('write_date', 'datetime'),  # Records modified since
-}
+})
 
 
 class SalesController(http.Controller):
@@ -31,11 +48,11 @@ class SalesController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
             limit, offset = get_pagination_params()
-            filters = get_filter_params(SALES_FILTERS)
+            filters = get_filter_params(SALES_FILTER_SPEC)
 
             orders_env = request.env['sale.order'].sudo()
 
@@ -49,20 +66,24 @@ class SalesController(http.Controller):
                     domain.append(('write_date', '>=', filters.pop('write_date')))
                 domain = build_domain(domain, filters)
 
-            # Get total count for pagination
-            total = orders_env.search_count(domain)
+            # Keyset pagination: continue after the last id of the previous page
+            after_id = get_after_id()
+            if after_id:
+                domain = domain + [('id', '>', after_id)]
+                offset = 0
 
-            # Get paginated results
-            orders = orders_env.search(domain, limit=limit, offset=offset, order='id')
+            # Get paginated results and total count in one query
+            orders, total = search_with_count(
+                orders_env, domain, limit, offset, count=get_count_param())
 
-            result = [self.__sale_order_to_dict(order) for order in orders]
+            result = self.__sale_orders_to_dicts(orders)
 
-            _logger.info(f'GET /sales - Returned {len(result)} of {total} sale orders')
-            return paginated_response(result, total, limit, offset)
+            _logger.info('GET /sales - Returned %s of %s sale orders', len(result), total)
+            return paginated_response(result, total, limit, offset, orders.ids[-1] if orders else None)
 
-        except Exception as exp:
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
+            return json_error("Internal server error", status=500)
 
     @http.route('/sales', type='http', auth='none', methods=['POST'], cors='*', csrf=False)
     def create_sales(self):
@@ -72,10 +93,12 @@ class SalesController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
-            payload = request.httprequest.json
+            payload, error = get_json_body()
+            if error:
+                return error
 
             if not isinstance(payload, list):
                 return json_error("Request body must be a JSON array")
@@ -86,14 +109,20 @@ class SalesController(http.Controller):
             if len(payload) > 100:
                 return json_error("Batch size cannot exceed 100 records")
 
+            valid, error = validate_records_are_objects(payload)
+            if not valid:
+                return error
+
             orders_env = request.env['sale.order'].sudo()
-            created_orders = []
 
             # Use savepoint for transaction handling
             with request.env.cr.savepoint():
+                # Check all partner references with one query
+                prefetch_foreign_keys('res.partner', [order_data.get('partner_id') for order_data in payload])
+
                 for idx, order_data in enumerate(payload):
                     # Validate required fields
-                    valid, error = validate_required_fields(order_data, ['mobile_uid', 'partner_id'])
+                    valid, error = validate_required_fields(order_data, REQUIRED_FIELDS)
                     if not valid:
                         return json_error(f"Validation failed at index {idx}", details={"mobile_uid": order_data.get('mobile_uid', f'item_{idx}')})
 
@@ -102,57 +131,95 @@ class SalesController(http.Controller):
                     if not valid:
                         return error
 
-                    mobile_uid = order_data.get('mobile_uid')
+                # Fetch all existing orders in one query instead of one per record
+                mobile_uids = [order_data['mobile_uid'] for order_data in payload]
+                orders_by_uid = {
+                    order.mobile_uid: order
+                    for order in orders_env.search([('mobile_uid', 'in', mobile_uids)])
+                }
+
+                # Update existing orders, collect new ones for a single batch create
+                create_vals = {}
+                updated_count = 0
+                for order_data in payload:
+                    mobile_uid = order_data['mobile_uid']
                     order_vals = self.__dict_to_sale_order_vals(order_data)
 
-                    order = orders_env.search([('mobile_uid', '=', mobile_uid)], limit=1)
+                    order = orders_by_uid.get(mobile_uid)
                     if order:
                         order_vals.pop('mobile_uid', None)
                         # Clear existing lines before adding new ones
                         if 'order_line' in order_vals:
                             order.order_line.unlink()
                         order.write(order_vals)
-                        _logger.info(f'Sale order {order.id} updated')
+                        updated_count += 1
+                    elif mobile_uid in create_vals:
+                        # Duplicate within the batch: later values win
+                        create_vals[mobile_uid].update(order_vals)
                     else:
-                        order = orders_env.create(order_vals)
-                        _logger.info(f'Sale order {order.id} created')
-
-                    created_orders.append(self.__sale_order_to_dict(order))
-
+                        create_vals[mobile_uid] = order_vals
+
+                if create_vals:
+                    new_orders = orders_env.create(list(create_vals.values()))
+                    orders_by_uid.update(zip(create_vals, new_orders))
+
+                # Serialize all touched orders with batched reads, in payload order
+                orders = orders_env.browse([order.id for order in orders_by_uid.values()])
+                dicts_by_uid = dict(zip(orders_by_uid, self.__sale_orders_to_dicts(orders)))
+                created_orders = [
+                    dicts_by_uid[order_data['mobile_uid']] for order_data in payload
+                ]
+
+            # One summary line per batch instead of one log call per record
+            _logger.info('POST /sales - Created %s and updated %s sale orders',
+                         len(create_vals), updated_count)
             return json_response({"count": len(created_orders), "data": created_orders})
 
-        except Exception as exp:
+        except UserError as exp:
+            # Business rule or constraint violated by the submitted data
+            _logger.warning('API validation error: %s', exp)
+            return json_error("Validation failed", details={"message": str(exp)})
+
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
-
-    def __sale_order_to_dict(self, order):
-        # Build order lines array
-        lines = []
-        for line in order.order_line:
-            lines.append({
-                'id': line.id,
-                'product_id': line.product_id.id if line.product_id else None,
-                'product_name': line.product_id.name if line.product_id else '',
-                'product_uom_qty': line.product_uom_qty,
-                'qty_delivered': line.qty_delivered,
-                'qty_invoiced': line.qty_invoiced,
-                'price_unit': line.price_unit,
-                'discount': line.discount,
-                'price_subtotal': line.price_subtotal,
-                'uom': line.product_uom.name if line.product_uom else '',
-            })
-
-        return {
-            'id': order.id,
-            'mobile_uid': order.mobile_uid or '',
-            'name': order.name or '',
-            'date_order': format_datetime(order.date_order),
-            'amount_total': order.amount_total,
-            'state': order.state or '',
-            'partner_id': order.partner_id.id if order.partner_id else None,
-            'write_date': format_datetime(order.write_date) if order.write_date else None,
-            'lines': lines,
-        }
+            return json_error("Internal server error", status=500)
+
+    def __sale_orders_to_dicts(self, orders):
+        """Serialize sale orders and their lines using batched read() calls."""
+        order_rows = orders.read(SALE_ORDER_READ_FIELDS, load=None)
+
+        # Fetch the lines of all orders, then their product and uom names, at once
+        lines = orders.env['sale.order.line'].browse([
+            line_id for row in order_rows for line_id in row['order_line']
+        ])
+        line_rows = lines.read(SALE_LINE_READ_FIELDS, load=None)
+        product_names = {row['id']: row['name'] for row in lines.product_id.read(['name'])}
+        uom_names = {row['id']: row['name'] for row in lines.product_uom.read(['name'])}
+
+        lines_by_id = {row['id']: {
+            'id': row['id'],
+            'product_id': row['product_id'] or None,
+            'product_name': product_names.get(row['product_id'], ''),
+            'product_uom_qty': row['product_uom_qty'],
+            'qty_delivered': row['qty_delivered'],
+            'qty_invoiced': row['qty_invoiced'],
+            'price_unit': row['price_unit'],
+            'discount': row['discount'],
+            'price_subtotal': row['price_subtotal'],
+            'uom': uom_names.get(row['product_uom'], ''),
+        } for row in line_rows}
+
+        return [{
+            'id': row['id'],
+            'mobile_uid': row['mobile_uid'] or '',
+            'name': row['name'] or '',
+            'date_order': row['date_order'] or None,
+            'amount_total': row['amount_total'],
+            'state': row['state'] or '',
+            'partner_id': row['partner_id'] or None,
+            'write_date': row['write_date'] or None,
+            'lines': [lines_by_id[line_id] for line_id in row['order_line']],
+        } for row in order_rows]
 
     def __dict_to_sale_order_vals(self, data):
         vals = {
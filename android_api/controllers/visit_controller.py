@@ -1,32 +1,53 @@
 # -*- coding: utf-8 -*-
 
 from odoo import http
+from odoo.exceptions import UserError
 from odoo.http import request
-from psycopg2 import IntegrityError
+from odoo.tools import SQL
 
 import logging
-import re
+from uuid import UUID
 
 from .auth import (
     api_authenticate, json_error, json_response, validate_required_fields,
     validate_foreign_key, check_rate_limit, get_pagination_params,
-    get_filter_params, build_domain, paginated_response, format_datetime,
-    parse_datetime
+    get_filter_params, build_domain, paginated_response, parse_datetime,
+    compile_filter_spec, unauthorized_response, get_json_body,
+    validate_records_are_objects, search_with_count, get_after_id,
+    prefetch_foreign_keys, get_count_param
 )
 
 _logger = logging.getLogger(__name__)
 
-# UUID v4 format regex
-UUID_REGEX = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$', re.IGNORECASE)
-
 # Maximum memo length (5000 characters)
 MAX_MEMO_LENGTH = 5000
 
+# Fields required for each record in POST /visits
+REQUIRED_FIELDS = ['mobile_uid', 'partner_id', 'visit_datetime']
+
+# Fields fetched when serializing visits (many2one fields are read as ids)
+VISIT_READ_FIELDS = ['mobile_uid', 'partner_id', 'visit_datetime', 'memo', 'write_date']
+
+# Page order of GET /visits; id breaks ties so keyset pagination is stable
+VISIT_ORDER = 'visit_datetime desc, id desc'
+
 # Allowed filters for GET endpoint
-VISIT_FILTERS = {
+VISIT_FILTER_SPEC = compile_filter_spec({
     'partner_id': ('partner_id', 'int'),
     'since': ('write_date', 'datetime'),  # Records modified since
-}
+})
+
+
+def _is_uuid4(value):
+    """Check that value is a UUID v4 in canonical 8-4-4-4-12 hex form."""
+    if not isinstance(value, str):
+        return False
+    try:
+        parsed = UUID(value)
+    except ValueError:
+        return False
+    # UUID() also accepts braces, urn: prefixes and other spellings
+    return parsed.version == 4 and str(parsed) == value.lower()
 
 
 class VisitController(http.Controller):
@@ -39,11 +60,11 @@ class VisitController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
             limit, offset = get_pagination_params()
-            filters = get_filter_params(VISIT_FILTERS)
+            filters = get_filter_params(VISIT_FILTER_SPEC)
 
             visits_env = request.env['res.partner.visit'].sudo()
 
@@ -57,20 +78,32 @@ class VisitController(http.Controller):
                     domain.append(('write_date', '>=', filters.pop('write_date')))
                 domain = build_domain(domain, filters)
 
-            # Get total count for pagination
-            total = visits_env.search_count(domain)
-
-            # Get paginated results
-            visits = visits_env.search(domain, limit=limit, offset=offset, order='visit_datetime desc')
-
-            result = [self.__visit_to_dict(visit) for visit in visits]
-
-            _logger.info(f'GET /visits - Returned {len(result)} of {total} visits')
-            return paginated_response(result, total, limit, offset)
-
-        except Exception as exp:
+            # Keyset pagination: visits are listed newest first, so continue with
+            # the visits ordered after the last one of the previous page
+            after_id = get_after_id()
+            if after_id:
+                after_visit = visits_env.browse(after_id).exists()
+                if not after_visit:
+                    return json_error("Invalid after_id", details={"after_id": after_id})
+                after_dt = after_visit.visit_datetime
+                domain = domain + [
+                    '|', ('visit_datetime', '<', after_dt),
+                    '&', ('visit_datetime', '=', after_dt), ('id', '<', after_id),
+                ]
+                offset = 0
+
+            # Get paginated results and total count in one query
+            visits, total = search_with_count(
+                visits_env, domain, limit, offset, order=VISIT_ORDER, count=get_count_param())
+
+            result = self.__visits_to_dicts(visits)
+
+            _logger.info('GET /visits - Returned %s of %s visits', len(result), total)
+            return paginated_response(result, total, limit, offset, visits.ids[-1] if visits else None)
+
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
+            return json_error("Internal server error", status=500)
 
     @http.route('/visits', type='http', auth='none', methods=['POST'], cors='*', csrf=False)
     def create_visits(self):
@@ -80,10 +113,12 @@ class VisitController(http.Controller):
             return error
 
         if not api_authenticate():
-            return json_error("Unauthorized", status=401)
+            return unauthorized_response()
 
         try:
-            payload = request.httprequest.json
+            payload, error = get_json_body()
+            if error:
+                return error
 
             if not isinstance(payload, list):
                 return json_error("Request body must be a JSON array")
@@ -94,21 +129,28 @@ class VisitController(http.Controller):
             if len(payload) > 100:
                 return json_error("Batch size cannot exceed 100 records")
 
+            valid, error = validate_records_are_objects(payload)
+            if not valid:
+                return error
+
             visits_env = request.env['res.partner.visit'].sudo()
-            created_visits = []
 
             # Use savepoint for transaction handling
             with request.env.cr.savepoint():
+                # Check all partner references with one query
+                prefetch_foreign_keys('res.partner', [visit_data.get('partner_id') for visit_data in payload])
+
+                visit_vals_by_uid = {}
                 for idx, visit_data in enumerate(payload):
                     # Validate required fields
-                    valid, error = validate_required_fields(visit_data, ['mobile_uid', 'partner_id', 'visit_datetime'])
+                    valid, error = validate_required_fields(visit_data, REQUIRED_FIELDS)
                     if not valid:
                         return json_error(f"Validation failed at index {idx}: missing required fields", details={"mobile_uid": visit_data.get('mobile_uid', f'item_{idx}')})
 
                     mobile_uid = visit_data.get('mobile_uid')
 
                     # Validate mobile_uid format (UUID v4)
-                    if not UUID_REGEX.match(str(mobile_uid)):
+                    if not _is_uuid4(mobile_uid):
                         return json_error(
                             f"Validation failed at index {idx}: invalid mobile_uid format",
                             details={"mobile_uid": mobile_uid, "expected": "UUID v4 format (xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx)"}
@@ -125,10 +167,15 @@ class VisitController(http.Controller):
 
                     # Validate memo length
                     memo = visit_data.get('memo')
-                    if memo and len(str(memo)) > MAX_MEMO_LENGTH:
+                    if memo and not isinstance(memo, str):
+                        return json_error(
+                            f"Validation failed at index {idx}: memo must be a string",
+                            details={"mobile_uid": mobile_uid}
+                        )
+                    if memo and len(memo) > MAX_MEMO_LENGTH:
                         return json_error(
                             f"Validation failed at index {idx}: memo exceeds maximum length",
-                            details={"mobile_uid": mobile_uid, "max_length": MAX_MEMO_LENGTH, "actual_length": len(str(memo))}
+                            details={"mobile_uid": mobile_uid, "max_length": MAX_MEMO_LENGTH, "actual_length": len(memo)}
                         )
 
                     # Validate foreign key
@@ -136,47 +183,88 @@ class VisitController(http.Controller):
                     if not valid:
                         return error
 
+                    # Duplicate within the batch: later values win
                     visit_vals = self.__dict_to_visit_vals(visit_data, parsed_dt)
-
-                    # Handle upsert with race condition protection
-                    try:
-                        visit = visits_env.search([('mobile_uid', '=', mobile_uid)], limit=1)
-                        if visit:
-                            visit_vals.pop('mobile_uid', None)
-                            visit.write(visit_vals)
-                            _logger.info(f'Visit {visit.id} updated')
-                        else:
-                            visit = visits_env.create(visit_vals)
-                            _logger.info(f'Visit {visit.id} created')
-                    except IntegrityError:
-                        # Race condition: another request created the record, retry as update
-                        request.env.cr.rollback()
-                        visit = visits_env.search([('mobile_uid', '=', mobile_uid)], limit=1)
-                        if visit:
-                            visit_vals.pop('mobile_uid', None)
-                            visit.write(visit_vals)
-                            _logger.info(f'Visit {visit.id} updated (after race condition)')
-                        else:
-                            raise  # Re-raise if still not found (shouldn't happen)
-
-                    created_visits.append(self.__visit_to_dict(visit))
-
+                    visit_vals_by_uid.setdefault(mobile_uid, {}).update(visit_vals)
+
+                # Insert or update the whole batch in a single statement. The
+                # unique mobile_uid constraint arbitrates concurrent requests,
+                # so no race condition retry is needed.
+                rows = self.__upsert_visits(visits_env, visit_vals_by_uid.values())
+                ids_by_uid = {mobile_uid: visit_id for visit_id, mobile_uid, _inserted in rows}
+                created = visits_env.browse([row[0] for row in rows if row[2]])
+                updated = visits_env.browse([row[0] for row in rows if not row[2]])
+
+                # The upsert bypasses create()/write(), notify webhooks here
+                created._notify_visit_webhooks('visit.created')
+                updated._notify_visit_webhooks('visit.updated')
+
+                # Serialize all touched visits with batched reads, in payload order
+                visits = visits_env.browse(list(ids_by_uid.values()))
+                dicts_by_uid = dict(zip(ids_by_uid, self.__visits_to_dicts(visits)))
+                created_visits = [dicts_by_uid[visit_data['mobile_uid']] for visit_data in payload]
+
+            # One summary line per batch instead of one log call per record
+            _logger.info('POST /visits - Created %s and updated %s visits',
+                         len(created), len(updated))
             return json_response({"count": len(created_visits), "data": created_visits})
 
-        except Exception as exp:
+        except UserError as exp:
+            # Business rule or constraint violated by the submitted data
+            _logger.warning('API validation error: %s', exp)
+            return json_error("Validation failed", details={"message": str(exp)})
+
+        except Exception:
             _logger.exception('API exception')
-            return json_error("Internal server error", status=500, details=str(exp))
-
-    def __visit_to_dict(self, visit):
-        return {
-            'id': visit.id,
-            'mobile_uid': visit.mobile_uid or '',
-            'partner_id': visit.partner_id.id if visit.partner_id else None,
-            'partner_name': visit.partner_id.name if visit.partner_id else '',
-            'visit_datetime': format_datetime(visit.visit_datetime) if visit.visit_datetime else None,
-            'memo': visit.memo or '',
-            'write_date': format_datetime(visit.write_date) if visit.write_date else None,
-        }
+            return json_error("Internal server error", status=500)
+
+    def __upsert_visits(self, visits_env, vals_list):
+        """Insert or update visits by mobile_uid with one INSERT ... ON CONFLICT.
+
+        Returns a list of (id, mobile_uid, inserted) rows.
+        """
+        uid = visits_env.env.uid
+        now = visits_env.env.cr.now()
+        query = SQL(
+            """
+            INSERT INTO %s (mobile_uid, partner_id, visit_datetime, memo,
+                            create_uid, create_date, write_uid, write_date)
+            VALUES %s
+            ON CONFLICT (mobile_uid) DO UPDATE SET
+                partner_id = EXCLUDED.partner_id,
+                visit_datetime = EXCLUDED.visit_datetime,
+                memo = COALESCE(EXCLUDED.memo, %s.memo),
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+            RETURNING id, mobile_uid, xmax = 0
+            """,
+            SQL.identifier(visits_env._table),
+            SQL(', ').join(
+                SQL('(%s, %s, %s, %s, %s, %s, %s, %s)',
+                    vals['mobile_uid'], vals['partner_id'], vals['visit_datetime'],
+                    vals.get('memo'), uid, now, uid, now)
+                for vals in vals_list
+            ),
+            SQL.identifier(visits_env._table),
+        )
+        rows = visits_env.env.execute_query(query)
+        # Values written in SQL are not in the ORM cache yet
+        visits_env.invalidate_model()
+        return rows
+
+    def __visits_to_dicts(self, visits):
+        """Serialize a visit recordset using batched read() calls."""
+        rows = visits.read(VISIT_READ_FIELDS, load=None)
+        partner_names = {row['id']: row['name'] for row in visits.partner_id.read(['name'])}
+        return [{
+            'id': row['id'],
+            'mobile_uid': row['mobile_uid'] or '',
+            'partner_id': row['partner_id'] or None,
+            'partner_name': partner_names.get(row['partner_id'], ''),
+            'visit_datetime': row['visit_datetime'] or None,
+            'memo': row['memo'] or '',
+            'write_date': row['write_date'] or None,
+        } for row in rows]
 
     def __dict_to_visit_vals(self, data, parsed_datetime=None):
         """Convert request data to Odoo field values.
@@ -202,7 +290,7 @@ class VisitController(http.Controller):
 
         memo = data.get('memo')
         if memo:
-            # Truncate memo to max length as safety measure
-            vals['memo'] = str(memo)[:MAX_MEMO_LENGTH]
+            # Type and length are checked by create_visits
+            vals['memo'] = memo
 
         return {k: v for k, v in vals.items() if v is not None}
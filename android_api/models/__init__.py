@@ -3,4 +3,5 @@ from . import sale_order
 from . import res_partner
 from . import account_payment
 from . import res_partner_visit
+from . import res_users_apikeys
 from . import webhook
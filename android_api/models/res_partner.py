@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class ResPartner(models.Model):
@@ -15,8 +15,20 @@ class ResPartner(models.Model):
         string='Mobile Sync Date',
         help='Date field for mobile app synchronization'
     )
+    has_sale_orders = fields.Boolean(
+        string='Has Sale Orders',
+        compute='_compute_has_sale_orders',
+        store=True,
+        index=True,
+        help='Stored flag used by the API to list customers without a sale order subquery'
+    )
 
     _sql_constraints = [
         ('mobile_uid_unique', 'UNIQUE(mobile_uid)',
          'Mobile UID must be unique!')
     ]
+
+    @api.depends('sale_order_ids')
+    def _compute_has_sale_orders(self):
+        for partner in self:
+            partner.has_sale_orders = bool(partner.sale_order_ids)
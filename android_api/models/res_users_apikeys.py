@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+from ..tools.auth_cache import clear_auth_cache
+
+
+class ResUsersApikeys(models.Model):
+    _inherit = 'res.users.apikeys'
+
+    # Revoked keys must not stay valid through the API key cache. Besides
+    # unlink(), keys are removed by _remove() (the "Delete API key" button)
+    # and by the expired key cleanup, which deletes rows in SQL.
+
+    def unlink(self):
+        result = super().unlink()
+        clear_auth_cache()
+        return result
+
+    def _remove(self):
+        result = super()._remove()
+        clear_auth_cache()
+        return result
+
+    @api.autovacuum
+    def _gc_user_apikeys(self):
+        result = super()._gc_user_apikeys()
+        clear_auth_cache()
+        return result
@@ -1,13 +1,171 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
-import requests
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+import certifi
+import socket
+import urllib3
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 import json
 import logging
 import hashlib
 import hmac
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from odoo.addons.queue_job.exception import RetryableJobError
+except ImportError:
+    RetryableJobError = None
 
 _logger = logging.getLogger(__name__)
 
+# Shared HTTP connection pool (per worker), so webhook calls reuse keep-alive
+# connections instead of doing a TCP and TLS handshake on every event
+_http = None
+_pool_lock = threading.Lock()
+WEBHOOK_POOL_CONNECTIONS = 32  # distinct hosts kept in the pool
+WEBHOOK_POOL_MAXSIZE = 64  # connections kept per host
+WEBHOOK_TIMEOUT = urllib3.Timeout(connect=3, read=10)  # seconds
+# urllib3 already disables Nagle (TCP_NODELAY); TCP keepalive also keeps idle
+# pooled connections from being dropped silently between bursts
+WEBHOOK_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+WEBHOOK_ERROR_MAX_LENGTH = 500  # characters of the delivery error kept in last_error
+WEBHOOK_JOB_PRIORITY = 10  # queue_job priority for webhook deliveries
+WEBHOOK_JOB_CHANNEL = 'root.webhook'  # queue_job channel, e.g. root.webhook:8
+
+# Delivery threads (per worker) used when queue_job is not installed, so
+# several webhooks are sent concurrently instead of one after the other.
+# Best-effort only: deliveries still queued when the worker is killed (memory
+# or time limit) are lost, install queue_job for guaranteed delivery.
+_executor = None
+_pending_deliveries = set()
+WEBHOOK_MAX_THREADS = 8
+
+# Webhook event -> subscription field on android.api.webhook
+WEBHOOK_EVENT_FIELDS = {
+    'customer.created': 'on_customer_create',
+    'customer.updated': 'on_customer_update',
+    'sale.created': 'on_sale_create',
+    'sale.updated': 'on_sale_update',
+    'delivery.created': 'on_delivery_create',
+    'delivery.updated': 'on_delivery_update',
+    'payment.created': 'on_payment_create',
+    'payment.updated': 'on_payment_update',
+    'visit.created': 'on_visit_create',
+    'visit.updated': 'on_visit_update',
+}
+
+# Fields whose change fires the *.updated webhook of each model: the fields
+# the mobile app syncs. Writes touching none of them notify nobody.
+WEBHOOK_WATCHED_FIELDS = {
+    'res.partner': frozenset({
+        'mobile_uid', 'name', 'city', 'vat', 'email', 'phone', 'website',
+        'partner_latitude', 'partner_longitude',
+    }),
+    'sale.order': frozenset({
+        'mobile_uid', 'name', 'date_order', 'state', 'partner_id', 'order_line',
+    }),
+    'stock.picking': frozenset({
+        'name', 'partner_id', 'scheduled_date', 'state', 'date_done', 'sale_id',
+        'move_ids', 'move_ids_without_package',
+    }),
+    'account.payment': frozenset({
+        'mobile_uid', 'name', 'partner_id', 'amount', 'date', 'memo', 'journal_id', 'state',
+    }),
+    'res.partner.visit': frozenset({'mobile_uid', 'partner_id', 'visit_datetime', 'memo'}),
+}
+
+# Active webhooks (in-memory, per worker): dbname -> ({event: ids}, expires_at)
+# Saves a search on every create/write of a notifying model, and lets events
+# nobody subscribed to return before any payload is built.
+_webhook_cache = {}
+WEBHOOK_CACHE_TTL = 60  # seconds
+
+# Keyed hash objects per webhook (in-memory, per worker):
+# (dbname, webhook_id) -> ((algorithm, secret), signer)
+# Changed secrets are detected on lookup, so entries never need invalidating.
+_signer_cache = {}
+
+# Fields written by trigger() itself; changing them does not invalidate the cache
+WEBHOOK_LOG_FIELDS = frozenset({'last_triggered', 'last_status', 'last_error'})
+
+
+def _dumps_payload(payload):
+    """Serialize a webhook payload to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str)
+    return json.dumps(payload, default=str).encode('utf-8')
+
+
+def _get_http():
+    """Return the shared webhook connection pool, creating it on first use."""
+    global _http
+    if _http is None:
+        with _pool_lock:
+            if _http is None:
+                _http = urllib3.PoolManager(
+                    num_pools=WEBHOOK_POOL_CONNECTIONS,
+                    maxsize=WEBHOOK_POOL_MAXSIZE,
+                    # Gateway errors mean the receiver was not reached, retry those
+                    # and connection failures. Read errors are not retried: the
+                    # receiver may already have the payload.
+                    retries=Retry(
+                        total=2,
+                        read=0,
+                        other=0,
+                        backoff_factor=0.2,
+                        status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset({'POST'}),
+                        raise_on_status=False,
+                    ),
+                    ca_certs=certifi.where(),  # same CA bundle as requests
+                    socket_options=WEBHOOK_SOCKET_OPTIONS,
+                )
+    return _http
+
+
+def _get_executor():
+    """Return the webhook delivery thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _pool_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=WEBHOOK_MAX_THREADS,
+                    thread_name_prefix='android_api_webhook',
+                )
+                # Runs before the pool's own exit hook, which waits for the
+                # queued deliveries, so they are still pending here
+                threading._register_atexit(_log_pending_deliveries)
+    return _executor
+
+
+def _submit_delivery(deliver):
+    """Queue a delivery on the thread pool, tracking it until it is done."""
+    future = _get_executor().submit(deliver)
+    _pending_deliveries.add(future)
+    future.add_done_callback(_pending_deliveries.discard)
+
+
+def _log_pending_deliveries():
+    """Warn about deliveries still queued when the worker shuts down."""
+    pending = sum(not future.done() for future in list(_pending_deliveries))
+    if pending:
+        _logger.warning(
+            '%s webhook deliveries still pending at shutdown, they are lost '
+            'unless the worker exits cleanly; install queue_job for guaranteed '
+            'delivery', pending)
+
 
 class AndroidApiWebhook(models.Model):
     _name = 'android.api.webhook'
@@ -16,6 +174,12 @@ class AndroidApiWebhook(models.Model):
     name = fields.Char(string='Name', required=True)
     url = fields.Char(string='Webhook URL', required=True)
     secret = fields.Char(string='Secret Key', help='Used to sign webhook payloads')
+    signature_algorithm = fields.Selection([
+        ('hmac_sha256', 'HMAC-SHA256'),
+        ('blake2b', 'Keyed BLAKE2b'),
+    ], string='Signature Algorithm', default='hmac_sha256', required=True,
+        help='Keyed BLAKE2b is a single pass over the payload, so it is cheaper '
+             'to compute and verify. Sent in the X-Webhook-Signature-Blake2b header.')
     active = fields.Boolean(default=True)
 
     # Events to trigger
@@ -38,15 +202,56 @@ class AndroidApiWebhook(models.Model):
     ], string='Last Status', readonly=True)
     last_error = fields.Text(string='Last Error', readonly=True)
 
+    @api.constrains('secret', 'signature_algorithm')
+    def _check_blake2b_secret(self):
+        for webhook in self:
+            if (webhook.signature_algorithm == 'blake2b' and webhook.secret
+                    and len(webhook.secret.encode('utf-8')) > hashlib.blake2b.MAX_KEY_SIZE):
+                raise ValidationError(
+                    f'Keyed BLAKE2b accepts secrets of at most {hashlib.blake2b.MAX_KEY_SIZE} bytes.'
+                )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        _webhook_cache.clear()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if not WEBHOOK_LOG_FIELDS.issuperset(vals):
+            _webhook_cache.clear()
+        return super().write(vals)
+
+    def unlink(self):
+        _webhook_cache.clear()
+        return super().unlink()
+
     def _compute_signature(self, payload):
-        """Compute HMAC-SHA256 signature for the payload."""
+        """Compute the signature for the payload bytes with the configured algorithm."""
         if not self.secret:
             return None
-        return hmac.new(
-            self.secret.encode('utf-8'),
-            payload.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        signer = self._get_signer().copy()
+        signer.update(payload)
+        return signer.hexdigest()
+
+    def _get_signer(self):
+        """Return the keyed hash object for this webhook, before any payload.
+
+        The key setup is done once per secret and algorithm; callers copy()
+        the returned object, so each signature only hashes its payload.
+        """
+        cache_key = (self.env.cr.dbname, self.id)
+        cached = _signer_cache.get(cache_key)
+        if cached and cached[0] == (self.signature_algorithm, self.secret):
+            return cached[1]
+
+        key = self.secret.encode('utf-8')
+        if self.signature_algorithm == 'blake2b':
+            signer = hashlib.blake2b(key=key, digest_size=32)
+        else:
+            # digest name keeps hmac on the OpenSSL HMAC implementation
+            signer = hmac.new(key, digestmod='sha256')
+        _signer_cache[cache_key] = ((self.signature_algorithm, self.secret), signer)
+        return signer
 
     def test_webhook(self):
         """Test webhook with sample data (called from UI button)."""
@@ -54,20 +259,22 @@ class AndroidApiWebhook(models.Model):
         self.trigger(
             'test.webhook',
             'android.api.webhook',
-            self.id,
-            {'message': 'Test webhook notification', 'webhook_name': self.name}
+            [(self.id, {'message': 'Test webhook notification', 'webhook_name': self.name})]
         )
 
-    def trigger(self, event, model, record_id, data):
-        """Trigger webhook with event data."""
+    def trigger(self, event, model, records):
+        """Trigger webhook with event data for a list of (record_id, data) tuples."""
         self.ensure_one()
 
-        payload = json.dumps({
+        # Serialized once: the same bytes are signed and sent
+        payload = _dumps_payload({
             'event': event,
             'model': model,
-            'record_id': record_id,
-            'data': data,
-        }, default=str)
+            'records': [
+                {'record_id': record_id, 'data': data}
+                for record_id, data in records
+            ],
+        })
 
         headers = {
             'Content-Type': 'application/json',
@@ -76,60 +283,143 @@ class AndroidApiWebhook(models.Model):
 
         signature = self._compute_signature(payload)
         if signature:
-            headers['X-Webhook-Signature'] = signature
+            if self.signature_algorithm == 'blake2b':
+                headers['X-Webhook-Signature-Blake2b'] = signature
+            else:
+                headers['X-Webhook-Signature'] = signature
 
         try:
-            response = requests.post(
+            response = _get_http().request(
+                'POST',
                 self.url,
-                data=payload,
+                body=payload,
                 headers=headers,
-                timeout=10
+                timeout=WEBHOOK_TIMEOUT
             )
-            response.raise_for_status()
-
-            self.write({
-                'last_triggered': fields.Datetime.now(),
-                'last_status': 'success',
-                'last_error': False,
-            })
-            _logger.info(f'Webhook {self.name} triggered successfully for {event}')
-
-        except requests.exceptions.RequestException as e:
-            self.write({
-                'last_triggered': fields.Datetime.now(),
-                'last_status': 'failed',
-                'last_error': str(e),
-            })
-            _logger.error(f'Webhook {self.name} failed: {e}')
+        except urllib3.exceptions.HTTPError as e:
+            error, retryable = str(e), True
+        else:
+            if response.status < 400:
+                self._log_delivery('success')
+                _logger.info('Webhook %s triggered successfully for %s', self.name, event)
+                return
+            error = f'HTTP {response.status} {response.reason or ""}'.strip()
+            # Other client errors will not go away by sending the same payload again
+            retryable = response.status >= 500 or response.status == 429
+
+        _logger.error('Webhook %s failed: %s', self.name, error)
+        if retryable and RetryableJobError is not None and self.env.context.get('job_uuid'):
+            # Running as a queue_job job: raising makes queue_job retry it, but
+            # also rolls back its transaction, so the failure is recorded apart
+            with self.env.registry.cursor() as cr:
+                self.with_env(self.env(cr=cr))._log_delivery('failed', error)
+            raise RetryableJobError(f'Webhook {self.name} failed: {error}')
+        self._log_delivery('failed', error)
+
+    def _log_delivery(self, status, error=None):
+        """Record the outcome of the last delivery.
+
+        Written in SQL: these are plain bookkeeping columns, so the ORM write
+        machinery (access checks, recomputes, write_date) is skipped.
+        """
+        self.ensure_one()
+        if error:
+            error = error[:WEBHOOK_ERROR_MAX_LENGTH]
+        self.env.execute_query(SQL(
+            "UPDATE %s SET last_triggered = %s, last_status = %s, last_error = %s WHERE id = %s",
+            SQL.identifier(self._table), fields.Datetime.now(), status, error, self.id,
+        ))
+        self.invalidate_recordset(['last_triggered', 'last_status', 'last_error'])
 
     @api.model
-    def notify(self, event, model, record_id, data):
-        """Send notifications to all matching active webhooks."""
-        event_field_map = {
-            'customer.created': 'on_customer_create',
-            'customer.updated': 'on_customer_update',
-            'sale.created': 'on_sale_create',
-            'sale.updated': 'on_sale_update',
-            'delivery.created': 'on_delivery_create',
-            'delivery.updated': 'on_delivery_update',
-            'payment.created': 'on_payment_create',
-            'payment.updated': 'on_payment_update',
-            'visit.created': 'on_visit_create',
-            'visit.updated': 'on_visit_update',
-        }
+    def notify(self, event, model, records):
+        """Send one notification per matching active webhook.
 
-        field_name = event_field_map.get(event)
-        if not field_name:
+        records is a list of (record_id, data) tuples, all sent in one payload.
+        """
+        if not records:
             return
 
-        webhooks = self.search([
-            ('active', '=', True),
-            (field_name, '=', True),
-        ])
+        webhooks = self._get_active_webhooks(event)
 
+        # queue_job installed in this database: deliver from the jobrunner, with retries
+        has_queue_job = 'queue.job' in self.env.registry
         for webhook in webhooks:
-            # Run in a new transaction to not block the main operation
-            webhook.with_delay().trigger(event, model, record_id, data) if hasattr(webhook, 'with_delay') else webhook.trigger(event, model, record_id, data)
+            if has_queue_job:
+                webhook.with_delay(
+                    priority=WEBHOOK_JOB_PRIORITY,
+                    channel=WEBHOOK_JOB_CHANNEL,
+                    description=f'webhook {event}',
+                ).trigger(event, model, records)
+            else:
+                webhook._trigger_after_commit(event, model, records)
+
+    @api.model
+    def _get_active_webhooks(self, event):
+        """Return the active webhooks subscribed to event, as superuser.
+
+        Deliveries are system work: the user whose write fires them may not
+        have access to webhook configurations.
+        """
+        return self.sudo().browse(self._get_event_subscriptions().get(event, ()))
+
+    @api.model
+    def _is_event_active(self, event):
+        """Return True if any active webhook is subscribed to event."""
+        return bool(self._get_event_subscriptions().get(event))
+
+    @api.model
+    def _get_event_subscriptions(self):
+        """Return {event: webhook ids} for all active webhooks, cached per worker.
+
+        A single query covers every event. Changes made through the ORM clear
+        the cache of the worker making them; other workers pick them up within
+        WEBHOOK_CACHE_TTL seconds.
+        """
+        dbname = self.env.cr.dbname
+        now = time.monotonic()
+        cached = _webhook_cache.get(dbname)
+        if cached and now < cached[1]:
+            return cached[0]
+
+        # Subscriptions are system configuration, also read on behalf of users
+        # without access to webhooks
+        rows = self.sudo().search_read([('active', '=', True)], list(WEBHOOK_EVENT_FIELDS.values()))
+        subscriptions = {
+            event: tuple(row['id'] for row in rows if row[field_name])
+            for event, field_name in WEBHOOK_EVENT_FIELDS.items()
+        }
+        _webhook_cache[dbname] = (subscriptions, now + WEBHOOK_CACHE_TTL)
+        return subscriptions
+
+    def _trigger_after_commit(self, event, model, records):
+        """Trigger the webhook in a delivery thread once the current
+        transaction is committed.
+
+        Keeps the HTTP call out of the caller's transaction: a slow or failing
+        receiver neither holds the transaction open nor rolls back the write,
+        and nothing is sent for writes that end up rolled back. Webhooks for
+        the same event are sent concurrently, and the caller does not wait.
+        Delivery is best-effort: see _log_pending_deliveries().
+        """
+        self.ensure_one()
+        webhook_id = self.id
+        registry = self.env.registry
+        uid = self.env.uid
+        context = self.env.context
+        su = self.env.su
+
+        def deliver():
+            try:
+                with registry.cursor() as cr:
+                    env = api.Environment(cr, uid, context, su=su)
+                    webhook = env['android.api.webhook'].browse(webhook_id)
+                    if webhook.exists():
+                        webhook.trigger(event, model, records)
+            except Exception:
+                _logger.exception('Webhook %s delivery failed for %s', webhook_id, event)
+
+        self.env.cr.postcommit.add(lambda: _submit_delivery(deliver))
 
 
 class ResPartnerWebhook(models.Model):
@@ -138,28 +428,26 @@ class ResPartnerWebhook(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            if record.mobile_uid:  # Only notify for mobile-synced records
-                self.env['android.api.webhook'].notify(
-                    'customer.created',
-                    'res.partner',
-                    record.id,
-                    {'mobile_uid': record.mobile_uid, 'name': record.name}
-                )
+        records._notify_partner_webhooks('customer.created')
         return records
 
     def write(self, vals):
         result = super().write(vals)
-        for record in self:
-            if record.mobile_uid:  # Only notify for mobile-synced records
-                self.env['android.api.webhook'].notify(
-                    'customer.updated',
-                    'res.partner',
-                    record.id,
-                    {'mobile_uid': record.mobile_uid, 'name': record.name}
-                )
+        if not WEBHOOK_WATCHED_FIELDS['res.partner'].isdisjoint(vals):
+            self._notify_partner_webhooks('customer.updated')
         return result
 
+    def _notify_partner_webhooks(self, event):
+        """Notify webhooks for mobile-synced partners in a single batch."""
+        mobile_records = self.filtered('mobile_uid')  # Only notify for mobile-synced records
+        if not mobile_records or not self.env['android.api.webhook']._is_event_active(event):
+            return
+        batch = [
+            (row['id'], {'mobile_uid': row['mobile_uid'], 'name': row['name']})
+            for row in mobile_records.read(['mobile_uid', 'name'])
+        ]
+        self.env['android.api.webhook'].notify(event, 'res.partner', batch)
+
 
 class SaleOrderWebhook(models.Model):
     _inherit = 'sale.order'
@@ -167,28 +455,26 @@ class SaleOrderWebhook(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            if record.mobile_uid:
-                self.env['android.api.webhook'].notify(
-                    'sale.created',
-                    'sale.order',
-                    record.id,
-                    {'mobile_uid': record.mobile_uid, 'name': record.name}
-                )
+        records._notify_sale_webhooks('sale.created')
         return records
 
     def write(self, vals):
         result = super().write(vals)
-        for record in self:
-            if record.mobile_uid:
-                self.env['android.api.webhook'].notify(
-                    'sale.updated',
-                    'sale.order',
-                    record.id,
-                    {'mobile_uid': record.mobile_uid, 'name': record.name}
-                )
+        if not WEBHOOK_WATCHED_FIELDS['sale.order'].isdisjoint(vals):
+            self._notify_sale_webhooks('sale.updated')
         return result
 
+    def _notify_sale_webhooks(self, event):
+        """Notify webhooks for mobile-synced sale orders in a single batch."""
+        mobile_records = self.filtered('mobile_uid')
+        if not mobile_records or not self.env['android.api.webhook']._is_event_active(event):
+            return
+        batch = [
+            (row['id'], {'mobile_uid': row['mobile_uid'], 'name': row['name']})
+            for row in mobile_records.read(['mobile_uid', 'name'])
+        ]
+        self.env['android.api.webhook'].notify(event, 'sale.order', batch)
+
 
 class StockPickingWebhook(models.Model):
     _inherit = 'stock.picking'
@@ -196,28 +482,26 @@ class StockPickingWebhook(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            if record.picking_type_code == 'outgoing':
-                self.env['android.api.webhook'].notify(
-                    'delivery.created',
-                    'stock.picking',
-                    record.id,
-                    {'name': record.name, 'state': record.state}
-                )
+        records._notify_delivery_webhooks('delivery.created')
         return records
 
     def write(self, vals):
         result = super().write(vals)
-        for record in self:
-            if record.picking_type_code == 'outgoing':
-                self.env['android.api.webhook'].notify(
-                    'delivery.updated',
-                    'stock.picking',
-                    record.id,
-                    {'name': record.name, 'state': record.state}
-                )
+        if not WEBHOOK_WATCHED_FIELDS['stock.picking'].isdisjoint(vals):
+            self._notify_delivery_webhooks('delivery.updated')
         return result
 
+    def _notify_delivery_webhooks(self, event):
+        """Notify webhooks for outgoing pickings in a single batch."""
+        outgoing = self.filtered(lambda picking: picking.picking_type_code == 'outgoing')
+        if not outgoing or not self.env['android.api.webhook']._is_event_active(event):
+            return
+        batch = [
+            (row['id'], {'name': row['name'], 'state': row['state']})
+            for row in outgoing.read(['name', 'state'])
+        ]
+        self.env['android.api.webhook'].notify(event, 'stock.picking', batch)
+
 
 class AccountPaymentWebhook(models.Model):
     _inherit = 'account.payment'
@@ -225,28 +509,26 @@ class AccountPaymentWebhook(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            if record.mobile_uid:
-                self.env['android.api.webhook'].notify(
-                    'payment.created',
-                    'account.payment',
-                    record.id,
-                    {'mobile_uid': record.mobile_uid, 'name': record.name}
-                )
+        records._notify_payment_webhooks('payment.created')
         return records
 
     def write(self, vals):
         result = super().write(vals)
-        for record in self:
-            if record.mobile_uid:
-                self.env['android.api.webhook'].notify(
-                    'payment.updated',
-                    'account.payment',
-                    record.id,
-                    {'mobile_uid': record.mobile_uid, 'name': record.name}
-                )
+        if not WEBHOOK_WATCHED_FIELDS['account.payment'].isdisjoint(vals):
+            self._notify_payment_webhooks('payment.updated')
         return result
 
+    def _notify_payment_webhooks(self, event):
+        """Notify webhooks for mobile-synced payments in a single batch."""
+        mobile_records = self.filtered('mobile_uid')
+        if not mobile_records or not self.env['android.api.webhook']._is_event_active(event):
+            return
+        batch = [
+            (row['id'], {'mobile_uid': row['mobile_uid'], 'name': row['name']})
+            for row in mobile_records.read(['mobile_uid', 'name'])
+        ]
+        self.env['android.api.webhook'].notify(event, 'account.payment', batch)
+
 
 class ResPartnerVisitWebhook(models.Model):
     _inherit = 'res.partner.visit'
@@ -254,32 +536,34 @@ class ResPartnerVisitWebhook(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            if record.mobile_uid:
-                self.env['android.api.webhook'].notify(
-                    'visit.created',
-                    'res.partner.visit',
-                    record.id,
-                    {
-                        'mobile_uid': record.mobile_uid,
-                        'partner_id': record.partner_id.id if record.partner_id else None,
-                        'partner_name': record.partner_id.name if record.partner_id else None
-                    }
-                )
+        records._notify_visit_webhooks('visit.created')
         return records
 
     def write(self, vals):
         result = super().write(vals)
-        for record in self:
-            if record.mobile_uid:
-                self.env['android.api.webhook'].notify(
-                    'visit.updated',
-                    'res.partner.visit',
-                    record.id,
-                    {
-                        'mobile_uid': record.mobile_uid,
-                        'partner_id': record.partner_id.id if record.partner_id else None,
-                        'partner_name': record.partner_id.name if record.partner_id else None
-                    }
-                )
+        if not WEBHOOK_WATCHED_FIELDS['res.partner.visit'].isdisjoint(vals):
+            self._notify_visit_webhooks('visit.updated')
         return result
+
+    def _notify_visit_webhooks(self, event):
+        """Notify webhooks for mobile-synced visits in a single batch.
+
+        Also called by the visits API, which upserts visits in SQL and so
+        bypasses create() and write().
+        """
+        mobile_records = self.filtered('mobile_uid')
+        if not mobile_records or not self.env['android.api.webhook']._is_event_active(event):
+            return
+        # Partner name, not display name, as GET /visits returns it
+        partner_names = {
+            row['id']: row['name'] for row in mobile_records.partner_id.read(['name'])
+        }
+        batch = [
+            (row['id'], {
+                'mobile_uid': row['mobile_uid'],
+                'partner_id': row['partner_id'] or None,
+                'partner_name': partner_names.get(row['partner_id'])
+            })
+            for row in mobile_records.read(['mobile_uid', 'partner_id'], load=None)
+        ]
+        self.env['android.api.webhook'].notify(event, 'res.partner.visit', batch)
@@ -3,3 +3,5 @@ from . import test_customer_api
 from . import test_sales_api
 from . import test_delivery_api
 from . import test_payment_api
+from . import test_visit_api
+from . import test_auth_api
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import json
+from odoo.tests import HttpCase
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class AndroidAPIHttpCase(HttpCase):
+    """Base class for Android API tests: an API key and auth headers."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Create API key for testing. Each class runs in its own rolled back
+        # transaction, so the key is generated once per class, here.
+        cls.user = cls.env.ref('base.user_admin')
+        cls.api_key_value = cls.env['res.users.apikeys']._generate(
+            scope='rpc',
+            name='Test API Key',
+            user_id=cls.user.id,
+        )
+
+    def _get_headers(self):
+        return {
+            'Authorization': f'Bearer {self.api_key_value}',
+            'Content-Type': 'application/json',
+        }
+
+    def _json(self, response):
+        """Parse a JSON response body, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return json.loads(response.content)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from odoo.addons.android_api.controllers import auth
+from odoo.addons.android_api.tools.auth_cache import clear_auth_cache
+
+from .common import AndroidAPIHttpCase
+
+
+@tagged('post_install', '-at_install')
+class TestAuthAPI(AndroidAPIHttpCase):
+    """Test cases for API key authentication and rate limiting."""
+
+    def setUp(self):
+        super().setUp()
+        # The caches are per worker and outlive the rolled back test transactions
+        clear_auth_cache()
+        self.addCleanup(clear_auth_cache)
+        auth._rate_limit_counts.clear()
+        self.addCleanup(auth._rate_limit_counts.clear)
+
+    def _patch_check_credentials(self):
+        apikeys_model = self.registry['res.users.apikeys']
+        return patch.object(apikeys_model, '_check_credentials', autospec=True,
+                            side_effect=apikeys_model._check_credentials)
+
+    def test_valid_key_is_cached(self):
+        """Test a validated API key is not verified again on the next request."""
+        response = self.url_open('/customer', headers=self._get_headers())
+        self.assertEqual(response.status_code, 200)
+
+        with self._patch_check_credentials() as mock_check:
+            response = self.url_open('/customer', headers=self._get_headers())
+        self.assertEqual(response.status_code, 200)
+        mock_check.assert_not_called()
+
+    def test_invalid_key_is_cached(self):
+        """Test a rejected API key is verified only once."""
+        headers = {'Authorization': 'Bearer invalid-test-key'}
+        with self._patch_check_credentials() as mock_check:
+            for _attempt in range(2):
+                response = self.url_open('/customer', headers=headers)
+                self.assertEqual(response.status_code, 401)
+        self.assertEqual(mock_check.call_count, 1)
+
+    def test_removed_key_is_rejected(self):
+        """Test an API key removed after being cached stops working."""
+        response = self.url_open('/customer', headers=self._get_headers())
+        self.assertEqual(response.status_code, 200)
+
+        self.env['res.users.apikeys'].search([
+            ('user_id', '=', self.user.id),
+            ('name', '=', 'Test API Key'),
+        ])._remove()
+
+        response = self.url_open('/customer', headers=self._get_headers())
+        self.assertEqual(response.status_code, 401)
+
+    def test_rate_limit(self):
+        """Test requests over the rate limit get 429 with a retry delay."""
+        headers = self._get_headers()
+        with patch.object(auth, 'RATE_LIMIT_REQUESTS', 2):
+            for _attempt in range(2):
+                response = self.url_open('/customer', headers=headers)
+                self.assertEqual(response.status_code, 200)
+
+            response = self.url_open('/customer', headers=headers)
+        self.assertEqual(response.status_code, 429)
+        details = self._json(response)['details']
+        self.assertEqual(details['limit'], 2)
+        self.assertLessEqual(details['retry_after'], auth.RATE_LIMIT_WINDOW)
+
+    def test_rate_limit_counts_are_capped(self):
+        """Test distinct keys beyond the counter cap evict the oldest counters."""
+        with patch.object(auth, 'RATE_LIMIT_MAX_ENTRIES', 3):
+            for attempt in range(5):
+                self.url_open('/customer', headers={'Authorization': f'Bearer flood-key-{attempt}'})
+            self.assertLessEqual(len(auth._rate_limit_counts), 3)
@@ -1,10 +1,18 @@
 # -*- coding: utf-8 -*-
 import json
-from odoo.tests import HttpCase, tagged
+from unittest.mock import patch
+
+from psycopg2 import IntegrityError
+
+from odoo.tests import tagged
+
+from odoo.addons.android_api.controllers import auth
+
+from .common import AndroidAPIHttpCase
 
 
 @tagged('post_install', '-at_install')
-class TestCustomerAPI(HttpCase):
+class TestCustomerAPI(AndroidAPIHttpCase):
     """Test cases for Customer API endpoints."""
 
     @classmethod
@@ -19,20 +27,6 @@ class TestCustomerAPI(HttpCase):
             'city': 'Test City',
         })
 
-        # Create API key for testing
-        cls.user = cls.env.ref('base.user_admin')
-        cls.api_key_value = cls.env['res.users.apikeys']._generate(
-            scope='rpc',
-            name='Test API Key',
-            user_id=cls.user.id,
-        )
-
-    def _get_headers(self):
-        return {
-            'Authorization': f'Bearer {self.api_key_value}',
-            'Content-Type': 'application/json',
-        }
-
     def test_get_customers_unauthorized(self):
         """Test GET /customer without auth returns 401."""
         response = self.url_open('/customer')
@@ -43,7 +37,7 @@ class TestCustomerAPI(HttpCase):
         response = self.url_open('/customer', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertIn('total', data)
         self.assertIn('data', data)
         self.assertIn('limit', data)
@@ -54,7 +48,7 @@ class TestCustomerAPI(HttpCase):
         response = self.url_open('/customer?limit=10&offset=0', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['limit'], 10)
         self.assertEqual(data['offset'], 0)
 
@@ -63,7 +57,7 @@ class TestCustomerAPI(HttpCase):
         response = self.url_open('/customer?city=Test%20City', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         for customer in data['data']:
             if customer['city']:
                 self.assertEqual(customer['city'], 'Test City')
@@ -84,7 +78,7 @@ class TestCustomerAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['count'], 1)
         self.assertEqual(data['data'][0]['name'], 'New Test Customer')
         self.assertEqual(data['data'][0]['mobile_uid'], 'new-test-uid-001')
@@ -104,7 +98,7 @@ class TestCustomerAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['data'][0]['name'], 'Updated Test Customer')
         self.assertEqual(data['data'][0]['city'], 'Updated City')
 
@@ -148,6 +142,15 @@ class TestCustomerAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 400)
 
+    def test_post_customer_malformed_json(self):
+        """Test POST /customer with a body that is not valid JSON returns error."""
+        response = self.url_open(
+            '/customer',
+            data='[{"mobile_uid": "broken"',
+            headers=self._get_headers(),
+        )
+        self.assertEqual(response.status_code, 400)
+
     def test_post_customer_batch_limit(self):
         """Test POST /customer batch size limit."""
         # Create 101 items (exceeds limit of 100)
@@ -162,3 +165,166 @@ class TestCustomerAPI(HttpCase):
             headers=self._get_headers(),
         )
         self.assertEqual(response.status_code, 400)
+
+    def test_post_customer_batch_mixed(self):
+        """Test POST /customer batch with updates, creates and duplicate mobile_uids."""
+        payload = json.dumps([
+            {'mobile_uid': 'test-uid-001', 'name': 'Updated In Batch'},
+            {'mobile_uid': 'mixed-batch-001', 'name': 'First Version'},
+            {'mobile_uid': 'mixed-batch-001', 'name': 'Second Version', 'city': 'Batch City'},
+        ])
+
+        response = self.url_open(
+            '/customer',
+            data=payload,
+            headers=self._get_headers(),
+        )
+        self.assertEqual(response.status_code, 200)
+
+        data = self._json(response)
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['data'][0]['id'], self.test_partner.id)
+        self.assertEqual(data['data'][0]['name'], 'Updated In Batch')
+        self.assertEqual(data['data'][1]['id'], data['data'][2]['id'])
+        self.assertEqual(data['data'][2]['name'], 'Second Version')
+        self.assertEqual(data['data'][2]['city'], 'Batch City')
+
+    def _create_customers(self, count):
+        return self.env['res.partner'].create([
+            {'name': f'Paging Customer {i}', 'mobile_uid': f'paging-uid-{i:03d}', 'customer_rank': 1}
+            for i in range(count)
+        ])
+
+    def test_get_customers_keyset_pagination(self):
+        """Test GET /customer pages with after_id / next_after_id."""
+        self._create_customers(3)
+
+        response = self.url_open('/customer?limit=2', headers=self._get_headers())
+        self.assertEqual(response.status_code, 200)
+        first_page = self._json(response)
+        self.assertTrue(first_page['has_more'])
+        self.assertEqual(first_page['next_after_id'], first_page['data'][-1]['id'])
+
+        response = self.url_open(
+            f"/customer?limit=2&after_id={first_page['next_after_id']}", headers=self._get_headers())
+        self.assertEqual(response.status_code, 200)
+        second_page = self._json(response)
+        self.assertEqual(second_page['offset'], 0)
+        self.assertTrue(second_page['data'])
+        for customer in second_page['data']:
+            self.assertGreater(customer['id'], first_page['next_after_id'])
+
+    def test_get_customers_without_count(self):
+        """Test GET /customer?count=0 skips the total."""
+        self._create_customers(2)
+
+        response = self.url_open('/customer?count=0&limit=1', headers=self._get_headers())
+        self.assertEqual(response.status_code, 200)
+
+        data = self._json(response)
+        self.assertIsNone(data['total'])
+        self.assertEqual(data['count'], 1)
+        # A full page means there may be more
+        self.assertTrue(data['has_more'])
+
+    def test_get_customers_gzip(self):
+        """Test GET /customer compresses large pages for gzip clients."""
+        self._create_customers(20)
+
+        headers = dict(self._get_headers(), **{'Accept-Encoding': 'gzip'})
+        response = self.url_open('/customer?limit=20', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', response.headers.get('Vary', ''))
+        self.assertEqual(self._json(response)['count'], 20)
+
+    def test_get_customers_brotli(self):
+        """Test GET /customer prefers brotli when installed and accepted."""
+        if auth.brotli is None:
+            self.skipTest('brotli is not installed')
+        self._create_customers(20)
+
+        headers = dict(self._get_headers(), **{'Accept-Encoding': 'br, gzip'})
+        response = self.url_open('/customer?limit=20', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Content-Encoding'), 'br')
+        self.assertEqual(self._json(response)['count'], 20)
+
+    def test_get_customers_brotli_not_installed(self):
+        """Test GET /customer falls back to gzip when brotli is not installed."""
+        self._create_customers(20)
+
+        headers = dict(self._get_headers(), **{'Accept-Encoding': 'br, gzip'})
+        with patch.object(auth, 'brotli', None):
+            response = self.url_open('/customer?limit=20', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertEqual(self._json(response)['count'], 20)
+
+    def test_get_customers_encoding_quality(self):
+        """Test GET /customer honours q=0 in Accept-Encoding."""
+        self._create_customers(20)
+
+        headers = dict(self._get_headers(), **{'Accept-Encoding': 'br;q=0, gzip;q=0.5'})
+        response = self.url_open('/customer?limit=20', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+
+        headers['Accept-Encoding'] = 'gzip;q=0'
+        response = self.url_open('/customer?limit=20', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_get_customers_uncompressed(self):
+        """Test GET /customer is sent as is without an accepted encoding."""
+        self._create_customers(20)
+
+        headers = dict(self._get_headers(), **{'Accept-Encoding': 'identity'})
+        response = self.url_open('/customer?limit=20', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(self._json(response)['count'], 20)
+
+    def test_post_customer_conflict(self):
+        """Test POST /customer returns 409 when a mobile_uid is created concurrently."""
+        payload = json.dumps([{
+            'mobile_uid': 'conflict-uid-001',
+            'name': 'Conflicting Customer',
+        }])
+
+        with patch.object(self.registry['res.partner'], 'create',
+                          side_effect=IntegrityError('duplicate key value')):
+            response = self.url_open(
+                '/customer',
+                data=payload,
+                headers=self._get_headers(),
+            )
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(self._json(response)['details']['retry'])
+
+    def test_post_customer_body_too_large(self):
+        """Test POST /customer with a body over the size limit returns 413."""
+        payload = '[' + ' ' * 1024 + ']'
+
+        with patch.object(auth, 'MAX_JSON_BODY_SIZE', 1024):
+            response = self.url_open(
+                '/customer',
+                data=payload,
+                headers=self._get_headers(),
+            )
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self._json(response)['details']['max_bytes'], 1024)
+
+    def test_post_customer_chunked_body_too_large(self):
+        """Test POST /customer with a chunked body over the size limit returns 413."""
+        # A generator body has no Content-Length, so it is sent chunked
+        chunks = (chunk.encode() for chunk in ['[', ' ' * 1024, ']'])
+
+        with patch.object(auth, 'MAX_JSON_BODY_SIZE', 1024):
+            response = self.url_open(
+                '/customer',
+                data=chunks,
+                headers=self._get_headers(),
+            )
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self._json(response)['details']['max_bytes'], 1024)
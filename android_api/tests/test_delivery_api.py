@@ -1,35 +1,22 @@
 # -*- coding: utf-8 -*-
-import json
-from odoo.tests import HttpCase, tagged
+from odoo.tests import tagged
+
+from .common import AndroidAPIHttpCase
 
 
 @tagged('post_install', '-at_install')
-class TestDeliveryAPI(HttpCase):
+class TestDeliveryAPI(AndroidAPIHttpCase):
     """Test cases for Delivery API endpoints."""
 
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        # Create API key for testing
-        cls.user = cls.env.ref('base.user_admin')
-        cls.api_key_value = cls.env['res.users.apikeys']._generate(
-            scope='rpc',
-            name='Test API Key',
-            user_id=cls.user.id,
-        )
-
         # Create test partner
         cls.test_partner = cls.env['res.partner'].create({
             'name': 'Test Customer for Delivery',
             'customer_rank': 1,
         })
 
-    def _get_headers(self):
-        return {
-            'Authorization': f'Bearer {self.api_key_value}',
-            'Content-Type': 'application/json',
-        }
-
     def test_get_deliveries_unauthorized(self):
         """Test GET /deliveries without auth returns 401."""
         response = self.url_open('/deliveries')
@@ -40,7 +27,7 @@ class TestDeliveryAPI(HttpCase):
         response = self.url_open('/deliveries', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertIn('total', data)
         self.assertIn('data', data)
         self.assertIn('limit', data)
@@ -51,7 +38,7 @@ class TestDeliveryAPI(HttpCase):
         response = self.url_open('/deliveries?limit=5&offset=0', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['limit'], 5)
         self.assertEqual(data['offset'], 0)
 
@@ -60,7 +47,7 @@ class TestDeliveryAPI(HttpCase):
         response = self.url_open('/deliveries?state=assigned', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         for delivery in data['data']:
             self.assertEqual(delivery['state'], 'assigned')
 
@@ -77,7 +64,7 @@ class TestDeliveryAPI(HttpCase):
         response = self.url_open('/deliveries', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         for delivery in data['data']:
             self.assertIn('lines', delivery)
             self.assertIsInstance(delivery['lines'], list)
@@ -1,23 +1,17 @@
 # -*- coding: utf-8 -*-
 import json
-from odoo.tests import HttpCase, tagged
+from odoo.tests import tagged
+
+from .common import AndroidAPIHttpCase
 
 
 @tagged('post_install', '-at_install')
-class TestPaymentAPI(HttpCase):
+class TestPaymentAPI(AndroidAPIHttpCase):
     """Test cases for Payment API endpoints."""
 
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        # Create API key for testing
-        cls.user = cls.env.ref('base.user_admin')
-        cls.api_key_value = cls.env['res.users.apikeys']._generate(
-            scope='rpc',
-            name='Test API Key',
-            user_id=cls.user.id,
-        )
-
         # Create test partner
         cls.test_partner = cls.env['res.partner'].create({
             'name': 'Test Customer for Payment',
@@ -30,12 +24,6 @@ class TestPaymentAPI(HttpCase):
             ('company_id', '=', cls.env.company.id),
         ], limit=1)
 
-    def _get_headers(self):
-        return {
-            'Authorization': f'Bearer {self.api_key_value}',
-            'Content-Type': 'application/json',
-        }
-
     def test_post_payment_unauthorized(self):
         """Test POST /payments without auth returns 401."""
         payload = json.dumps([{
@@ -63,7 +51,7 @@ class TestPaymentAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['count'], 1)
         self.assertEqual(data['data'][0]['mobile_uid'], 'payment-test-001')
         self.assertEqual(data['data'][0]['amount'], 500.00)
@@ -92,7 +80,7 @@ class TestPaymentAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['data'][0]['amount'], 200.00)
         self.assertEqual(data['data'][0]['memo'], 'Updated memo')
 
@@ -144,7 +132,7 @@ class TestPaymentAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['data'][0]['journal_id'], self.bank_journal.id)
 
     def test_post_payment_batch(self):
@@ -169,5 +157,5 @@ class TestPaymentAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['count'], 2)
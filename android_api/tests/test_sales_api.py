@@ -1,23 +1,17 @@
 # -*- coding: utf-8 -*-
 import json
-from odoo.tests import HttpCase, tagged
+from odoo.tests import tagged
+
+from .common import AndroidAPIHttpCase
 
 
 @tagged('post_install', '-at_install')
-class TestSalesAPI(HttpCase):
+class TestSalesAPI(AndroidAPIHttpCase):
     """Test cases for Sales Order API endpoints."""
 
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        # Create API key for testing
-        cls.user = cls.env.ref('base.user_admin')
-        cls.api_key_value = cls.env['res.users.apikeys']._generate(
-            scope='rpc',
-            name='Test API Key',
-            user_id=cls.user.id,
-        )
-
         # Create test partner
         cls.test_partner = cls.env['res.partner'].create({
             'name': 'Test Customer for Sales',
@@ -30,12 +24,6 @@ class TestSalesAPI(HttpCase):
             'mobile_uid': 'test-sale-uid-001',
         })
 
-    def _get_headers(self):
-        return {
-            'Authorization': f'Bearer {self.api_key_value}',
-            'Content-Type': 'application/json',
-        }
-
     def test_get_sales_unauthorized(self):
         """Test GET /sales without auth returns 401."""
         response = self.url_open('/sales')
@@ -46,7 +34,7 @@ class TestSalesAPI(HttpCase):
         response = self.url_open('/sales', headers=self._get_headers())
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertIn('total', data)
         self.assertIn('data', data)
 
@@ -58,7 +46,7 @@ class TestSalesAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         for order in data['data']:
             self.assertEqual(order['partner_id'], self.test_partner.id)
 
@@ -77,7 +65,7 @@ class TestSalesAPI(HttpCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        data = json.loads(response.content)
+        data = self._json(response)
         self.assertEqual(data['count'], 1)
         self.assertEqual(data['data'][0]['mobile_uid'], 'new-sale-uid-001')
 
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from odoo.addons.android_api.models import webhook as webhook_module
+
+from .common import AndroidAPIHttpCase
+
+
+@tagged('post_install', '-at_install')
+class TestVisitAPI(AndroidAPIHttpCase):
+    """Test cases for Visit API endpoints."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Create test partner
+        cls.test_partner = cls.env['res.partner'].create({
+            'name': 'Test Customer for Visits',
+            'customer_rank': 1,
+        })
+
+        # Create test visit
+        cls.test_visit = cls.env['res.partner.visit'].create({
+            'partner_id': cls.test_partner.id,
+            'mobile_uid': '3f0c1b2e-8a4d-4c6e-9b1a-2d3e4f5a6b7c',
+            'visit_datetime': '2024-01-15 10:00:00',
+            'memo': 'First visit',
+        })
+
+        # Subscribe a webhook to visit events so visits notify
+        cls.webhook = cls.env['android.api.webhook'].create({
+            'name': 'Test Visit Webhook',
+            'url': 'https://example.com/webhook',
+        })
+        # The webhook cache outlives the rolled back test transaction
+        cls.addClassCleanup(webhook_module._webhook_cache.clear)
+
+    def _post_visits(self, visits):
+        return self.url_open(
+            '/visits',
+            data=json.dumps(visits),
+            headers=self._get_headers(),
+        )
+
+    def test_post_visit_create(self):
+        """Test POST /visits creates a new visit."""
+        response = self._post_visits([{
+            'mobile_uid': 'a1b2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c5d',
+            'partner_id': self.test_partner.id,
+            'visit_datetime': '2024-02-01T09:30:00',
+            'memo': 'New visit',
+        }])
+        self.assertEqual(response.status_code, 200)
+
+        data = self._json(response)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['data'][0]['mobile_uid'], 'a1b2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c5d')
+        self.assertEqual(data['data'][0]['partner_name'], 'Test Customer for Visits')
+        self.assertEqual(data['data'][0]['memo'], 'New visit')
+
+        visit = self.env['res.partner.visit'].browse(data['data'][0]['id'])
+        self.assertEqual(visit.mobile_uid, 'a1b2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c5d')
+        self.assertEqual(visit.partner_id, self.test_partner)
+
+    def test_post_visit_update(self):
+        """Test POST /visits with an existing mobile_uid updates that visit."""
+        # Load the visit in the ORM cache before the SQL upsert changes it
+        self.assertEqual(self.test_visit.memo, 'First visit')
+
+        response = self._post_visits([{
+            'mobile_uid': self.test_visit.mobile_uid,
+            'partner_id': self.test_partner.id,
+            'visit_datetime': '2024-01-15T11:00:00',
+            'memo': 'Updated visit',
+        }])
+        self.assertEqual(response.status_code, 200)
+
+        data = self._json(response)
+        self.assertEqual(data['data'][0]['id'], self.test_visit.id)
+        self.assertEqual(data['data'][0]['memo'], 'Updated visit')
+        self.assertEqual(self.env['res.partner.visit'].search_count([
+            ('mobile_uid', '=', self.test_visit.mobile_uid),
+        ]), 1)
+
+        # The ORM cache must not serve the values from before the upsert
+        self.assertEqual(self.test_visit.memo, 'Updated visit')
+        self.assertEqual(str(self.test_visit.visit_datetime), '2024-01-15 11:00:00')
+
+    def test_post_visit_batch_mixed(self):
+        """Test POST /visits batch with an update, a create and a duplicate mobile_uid."""
+        response = self._post_visits([
+            {
+                'mobile_uid': self.test_visit.mobile_uid,
+                'partner_id': self.test_partner.id,
+                'visit_datetime': '2024-01-15T10:00:00',
+                'memo': 'Updated in batch',
+            },
+            {
+                'mobile_uid': 'b2c3d4e5-f6a7-4b8c-9d0e-1f2a3b4c5d6e',
+                'partner_id': self.test_partner.id,
+                'visit_datetime': '2024-03-01T08:00:00',
+                'memo': 'First version',
+            },
+            {
+                'mobile_uid': 'b2c3d4e5-f6a7-4b8c-9d0e-1f2a3b4c5d6e',
+                'partner_id': self.test_partner.id,
+                'visit_datetime': '2024-03-01T08:00:00',
+                'memo': 'Second version',
+            },
+        ])
+        self.assertEqual(response.status_code, 200)
+
+        data = self._json(response)
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['data'][0]['id'], self.test_visit.id)
+        self.assertEqual(data['data'][0]['memo'], 'Updated in batch')
+        self.assertEqual(data['data'][1]['id'], data['data'][2]['id'])
+        self.assertNotEqual(data['data'][1]['id'], self.test_visit.id)
+        self.assertEqual(data['data'][2]['memo'], 'Second version')
+
+    def test_post_visit_notifies_webhooks(self):
+        """Test POST /visits notifies created and updated visits separately."""
+        notify = self.registry['android.api.webhook'].notify
+        with patch.object(self.registry['android.api.webhook'], 'notify', autospec=True,
+                          side_effect=notify) as mock_notify:
+            response = self._post_visits([
+                {
+                    'mobile_uid': self.test_visit.mobile_uid,
+                    'partner_id': self.test_partner.id,
+                    'visit_datetime': '2024-01-15T10:00:00',
+                },
+                {
+                    'mobile_uid': 'c3d4e5f6-a7b8-4c9d-8e1f-2a3b4c5d6e7f',
+                    'partner_id': self.test_partner.id,
+                    'visit_datetime': '2024-04-01T08:00:00',
+                },
+            ])
+        self.assertEqual(response.status_code, 200)
+        created_id = self._json(response)['data'][1]['id']
+
+        events = {call.args[1]: call.args[3] for call in mock_notify.call_args_list}
+        self.assertEqual(
+            [record_id for record_id, _data in events['visit.updated']], [self.test_visit.id])
+        self.assertEqual(
+            [record_id for record_id, _data in events['visit.created']], [created_id])
+        self.assertEqual(
+            events['visit.created'][0][1]['partner_id'], self.test_partner.id)
+
+    def test_post_visit_invalid_mobile_uid(self):
+        """Test POST /visits with a mobile_uid that is not a UUID v4 returns error."""
+        response = self._post_visits([{
+            'mobile_uid': 'not-a-uuid',
+            'partner_id': self.test_partner.id,
+            'visit_datetime': '2024-02-01T09:30:00',
+        }])
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_visits_keyset_pagination(self):
+        """Test GET /visits pages through (visit_datetime, id) with after_id."""
+        # Visits sharing a visit_datetime are ordered by id
+        self.env['res.partner.visit'].create([
+            {'partner_id': self.test_partner.id, 'visit_datetime': visit_datetime}
+            for visit_datetime in ('2024-01-15 10:00:00', '2024-01-15 10:00:00', '2024-01-20 09:00:00')
+        ])
+        expected_ids = self.env['res.partner.visit'].search([], order='visit_datetime desc, id desc').ids
+
+        seen_ids = []
+        url = '/visits?limit=1'
+        for _page in expected_ids:
+            response = self.url_open(url, headers=self._get_headers())
+            self.assertEqual(response.status_code, 200)
+            data = self._json(response)
+            seen_ids += [visit['id'] for visit in data['data']]
+            if not data['has_more']:
+                break
+            self.assertEqual(data['next_after_id'], data['data'][-1]['id'])
+            url = f"/visits?limit=1&after_id={data['next_after_id']}"
+        self.assertEqual(seen_ids, expected_ids)
+
+    def test_get_visits_invalid_after_id(self):
+        """Test GET /visits with an after_id of no visit returns error."""
+        missing_id = self.env['res.partner.visit'].search([], order='id desc', limit=1).id + 1000
+        response = self.url_open(f'/visits?after_id={missing_id}', headers=self._get_headers())
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory API key validation caches, shared by the API controllers (which
+fill them) and the res.users.apikeys model (which clears them on revocation).
+"""
+
+# API key cache (in-memory, per worker, LRU): (dbname, sha256(key)) -> (user_id, expires_at)
+# Skips the expensive key hash verification for keys seen recently.
+auth_cache = {}
+AUTH_CACHE_TTL = 300  # seconds
+AUTH_CACHE_MAX_SIZE = 10000
+
+# Rejected API keys (in-memory, per worker): (dbname, sha256(key)) -> expires_at
+# Repeated invalid keys cost a dict lookup instead of a key hash verification.
+auth_negative_cache = {}
+AUTH_NEGATIVE_CACHE_TTL = 10  # seconds
+AUTH_NEGATIVE_CACHE_MAX_SIZE = 1024
+
+
+def clear_auth_cache():
+    """Forget every cached API key validation of this worker."""
+    auth_cache.clear()
+    auth_negative_cache.clear()
+
+
+def cache_put(cache, key, value, max_size):
+    """Store a value in a bounded cache dict, evicting the first inserted entry when full."""
+    if key not in cache and len(cache) >= max_size:
+        cache.pop(next(iter(cache), None), None)
+    cache[key] = value